@@ -5,18 +5,42 @@
 # 5. Convert to Long-Lived Token (60 days)
 
 import os
+import re
+import asyncio
 import json
 import requests
-import schedule
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import shutil
+import errno
 import hashlib
+import functools
+import atexit
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 from openai import OpenAI
 
+# Optional fast JSON encoder/decoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional async HTTP client for the Instagram two-step publish
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP2_AVAILABLE = False
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -30,14 +54,19 @@ PENDING_DIR = BASE_DIR / "Pending_Approval"
 DONE_DIR = BASE_DIR / "Done"
 LOGS_DIR = BASE_DIR / "Logs"
 BRIEFINGS_DIR = BASE_DIR / "Briefings"
+ACTIVITY_LOG = LOGS_DIR / "meta_activity.jsonl"
+BATCH_STATE_DIR = LOGS_DIR / "meta_batches"
 
 # Ensure directories exist
-for directory in [APPROVED_DIR, PENDING_DIR, DONE_DIR, LOGS_DIR, BRIEFINGS_DIR]:
+for directory in [APPROVED_DIR, PENDING_DIR, DONE_DIR, LOGS_DIR, BRIEFINGS_DIR, BATCH_STATE_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # Meta API Configuration
 META_API_VERSION = "v18.0"
 GRAPH_API_URL = f"https://graph.facebook.com/{META_API_VERSION}"
+GRAPH_PAGE_SIZE = 100
+IG_PLACEHOLDER_IMAGE_URL = "https://via.placeholder.com/1080x1080.png?text=Post"
+GRAPH_MAX_PAGES = 10
 
 # Environment variables
 FB_PAGE_ID = os.getenv("FB_PAGE_ID", "")
@@ -46,10 +75,88 @@ IG_USER_ID = os.getenv("IG_USER_ID", "")
 IG_ACCESS_TOKEN = os.getenv("IG_ACCESS_TOKEN", "")
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
 
+# Maximum approved files posted to the Graph API at the same time
+MAX_CONCURRENT_POSTS = int(os.getenv("META_MAX_CONCURRENT_POSTS", "10"))
+
 # Qwen/OpenAI client (adjust base_url if using different provider)
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
+# Batch API for post generation. Needs a provider with the OpenAI Batch API
+# at OPENROUTER_BASE_URL (e.g. DashScope); OpenRouter itself has none
+BATCH_GENERATION = os.getenv("META_BATCH_GENERATION", "").lower() in ("1", "true", "yes")
+BATCH_COMPLETION_WINDOW = "24h"
+_OPENROUTER_HEADERS = {"Authorization": f"Bearer {OPENROUTER_API_KEY}"}
+_OPENROUTER_JSON_HEADERS = {**_OPENROUTER_HEADERS, "Content-Type": "application/json"}
+
+# Shared HTTP session: keep-alive connections and 429/5xx backoff for every
+# Graph API and OpenRouter call. Retries stay on idempotent methods so a
+# publish request is never sent twice.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Frontmatter block and its "key: value" lines
+_FRONTMATTER_RE = re.compile(r"\A---[ \t]*\n(.*?)^---[ \t]*$(.*)\Z", re.DOTALL | re.MULTILINE)
+_FRONTMATTER_LINE_RE = re.compile(r"^([^:\n]+):(.*)$", re.MULTILINE)
+
+# Dashboard section owned by this module
+_DASHBOARD_SECTION_RE = re.compile(r"^## Social Media Activity\n.*?(?=^## |\Z)", re.DOTALL | re.MULTILINE)
+DASHBOARD_ACTIVITY_LIMIT = 50
+
+# Markdown template for generated posts awaiting approval
+_MD_TEMPLATE = """---
+type: meta_post
+platform: {plat}
+topic: {topic}
+generated: {ts}
+status: pending_approval
+---
+## Post Content
+
+{post}
+
+## Hashtags
+
+{tags}
+
+## To Approve
+
+Move this file to /Approved/ to publish this post.
+"""
+
+
+# Open log file handles, kept for the life of the process
+_LOG_HANDLES = {}
+_LOG_LOCK = threading.Lock()
+
+
+def _close_log_handles():
+    """Flush and close all cached log file handles."""
+    with _LOG_LOCK:
+        for handle in _LOG_HANDLES.values():
+            handle.close()
+        _LOG_HANDLES.clear()
+
+
+atexit.register(_close_log_handles)
+
+
+def _json_dumps(obj):
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def _log_to_file(filename, message, level="INFO"):
@@ -57,9 +164,15 @@ def _log_to_file(filename, message, level="INFO"):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] [{level}] {message}\n"
     
-    log_file = LOGS_DIR / filename
-    with open(log_file, "a", encoding="utf-8") as f:
+    with _LOG_LOCK:
+        f = _LOG_HANDLES.get(filename)
+        if f is None:
+            f = open(LOGS_DIR / filename, "a", encoding="utf-8", buffering=8192)
+            _LOG_HANDLES[filename] = f
         f.write(log_entry)
+        # Flush problems immediately; routine entries stay buffered
+        if level in ("ERROR", "WARNING"):
+            f.flush()
     
     # Also print to console
     if level == "ERROR":
@@ -72,9 +185,60 @@ def _log_to_file(filename, message, level="INFO"):
         print(f"{Fore.CYAN}[{level}] {message}")
 
 
+@functools.lru_cache(maxsize=1024)
 def _generate_content_hash(content):
     """Generate a unique hash for content to create unique filenames."""
-    return hashlib.md5(content.encode()).hexdigest()[:8]
+    return hashlib.blake2b(content.encode(), digest_size=4).hexdigest()
+
+
+def _get_platform_prompts(topic):
+    """Build the platform-specific system/user prompts for a topic."""
+    return {
+        "facebook": {
+            "system": f"""You are a social media expert. Write an engaging post for Facebook.
+Style guidelines:
+- Conversational and friendly tone
+- Maximum 150 words
+- Include 2-3 relevant hashtags at the end
+- Focus on engagement and conversation starters
+- Avoid excessive emojis (1-2 max)""",
+            "user": f"Write a Facebook post about: {topic}"
+        },
+        "instagram": {
+            "system": f"""You are a social media expert. Write an engaging post for Instagram.
+Style guidelines:
+- Visual-focused, evocative language
+- Maximum 100 words
+- Include 5-8 relevant hashtags
+- Emoji friendly (3-5 emojis)
+- Focus on inspiration and aesthetics""",
+            "user": f"Write an Instagram post about: {topic}"
+        }
+    }
+
+
+def _write_post_file(plat, topic, content, timestamp, generated, suffix=""):
+    """Write generated post content to a pending-approval markdown file."""
+    # Parse content and hashtags
+    post_content, hashtags = _parse_post_content(content)
+    
+    # Create markdown file
+    filename = f"META_{plat}_{timestamp}{suffix}.md"
+    filepath = PENDING_DIR / filename
+    
+    md_content = _MD_TEMPLATE.format_map({
+        "plat": plat,
+        "topic": topic,
+        "ts": generated,
+        "post": post_content,
+        "tags": hashtags
+    })
+    
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(md_content)
+    
+    _log_to_file("meta_poster.log", f"Generated {plat} post: {filename}", "SUCCESS")
+    return filepath
 
 
 def generate_social_post(topic, platform="both"):
@@ -89,31 +253,12 @@ def generate_social_post(topic, platform="both"):
         Path to generated file, or None if failed
     """
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        generated = now.strftime("%Y-%m-%d %H:%M:%S")
         
         # Define platform-specific prompts
-        platform_prompts = {
-            "facebook": {
-                "system": f"""You are a social media expert. Write an engaging post for Facebook.
-Style guidelines:
-- Conversational and friendly tone
-- Maximum 150 words
-- Include 2-3 relevant hashtags at the end
-- Focus on engagement and conversation starters
-- Avoid excessive emojis (1-2 max)""",
-                "user": f"Write a Facebook post about: {topic}"
-            },
-            "instagram": {
-                "system": f"""You are a social media expert. Write an engaging post for Instagram.
-Style guidelines:
-- Visual-focused, evocative language
-- Maximum 100 words
-- Include 5-8 relevant hashtags
-- Emoji friendly (3-5 emojis)
-- Focus on inspiration and aesthetics""",
-                "user": f"Write an Instagram post about: {topic}"
-            }
-        }
+        platform_prompts = _get_platform_prompts(topic)
         
         platforms_to_generate = ["facebook", "instagram"] if platform == "both" else [platform]
         generated_files = []
@@ -131,46 +276,209 @@ Style guidelines:
                 _log_to_file("meta_poster.log", f"Failed to generate content for {plat}", "ERROR")
                 continue
             
-            # Parse content and hashtags
-            post_content, hashtags = _parse_post_content(content)
-            
-            # Create markdown file
-            filename = f"META_{plat}_{timestamp}.md"
-            filepath = PENDING_DIR / filename
-            
-            md_content = f"""---
-type: meta_post
-platform: {plat}
-topic: {topic}
-generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-status: pending_approval
----
-## Post Content
-
-{post_content}
-
-## Hashtags
-
-{hashtags}
+            generated_files.append(_write_post_file(plat, topic, content, timestamp, generated))
+        
+        return generated_files if generated_files else None
+        
+    except Exception as e:
+        _log_to_file("meta_poster.log", f"Error generating post: {str(e)}", "ERROR")
+        return None
 
-## To Approve
 
-Move this file to /Approved/ to publish this post.
-"""
-            
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(md_content)
+def generate_social_posts_batch(topics):
+    """
+    Queue post generation for several topics through the Batch API.
+    
+    Non-urgent generations are billed at a reduced rate and are not
+    subject to per-minute rate limits. Results are materialized into
+    /Pending_Approval/ by _poll_batches() once the batch completes.
+    Requires META_BATCH_GENERATION and a provider with a Batch API.
+    
+    Args:
+        topics: List of (topic, platform) tuples, platform being
+                'facebook', 'instagram', or 'both'
+    
+    Returns:
+        Batch ID if submitted, None otherwise
+    """
+    try:
+        if not BATCH_GENERATION:
+            _log_to_file("meta_poster.log", "META_BATCH_GENERATION not enabled. Cannot submit batch.", "ERROR")
+            return None
+        
+        if not OPENROUTER_API_KEY:
+            _log_to_file("meta_poster.log", "OPENROUTER_API_KEY not set. Cannot submit batch.", "ERROR")
+            return None
+        
+        lines = []
+        requests_map = {}
+        for i, (topic, platform) in enumerate(topics):
+            platform_prompts = _get_platform_prompts(topic)
+            platforms_to_generate = ["facebook", "instagram"] if platform == "both" else [platform]
             
-            generated_files.append(filepath)
-            _log_to_file("meta_poster.log", f"Generated {plat} post: {filename}", "SUCCESS")
+            for plat in platforms_to_generate:
+                # Index-based so repeated topics still get unique ids
+                custom_id = f"{i}_{plat}"
+                prompt_config = platform_prompts[plat]
+                lines.append(_json_dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": OPENROUTER_MODEL,
+                        "messages": [
+                            {"role": "system", "content": prompt_config["system"]},
+                            {"role": "user", "content": prompt_config["user"]}
+                        ],
+                        "max_tokens": 500,
+                        "temperature": 0.7
+                    }
+                }))
+                requests_map[custom_id] = {"topic": topic, "platform": plat}
         
-        return generated_files if generated_files else None
+        if not lines:
+            _log_to_file("meta_poster.log", "No topics to batch", "INFO")
+            return None
+        
+        # Step 1: Upload the JSONL input file
+        upload_response = _SESSION.post(
+            f"{OPENROUTER_BASE_URL}/files",
+            headers=_OPENROUTER_HEADERS,
+            data={"purpose": "batch"},
+            files={"file": ("meta_batch.jsonl", b"\n".join(lines))},
+            timeout=60
+        )
+        upload_response.raise_for_status()
+        input_file_id = _json_loads(upload_response.content)["id"]
+        
+        # Step 2: Create the batch
+        batch_response = _SESSION.post(
+            f"{OPENROUTER_BASE_URL}/batches",
+            headers=_OPENROUTER_HEADERS,
+            json={
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": BATCH_COMPLETION_WINDOW
+            },
+            timeout=30
+        )
+        batch_response.raise_for_status()
+        batch_id = _json_loads(batch_response.content)["id"]
+        
+        # Persist the batch so _poll_batches() can pick it up later
+        _save_batch_state(BATCH_STATE_DIR / f"batch_{batch_id}.json", {
+            "batch_id": batch_id,
+            "submitted": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "requests": requests_map,
+            "materialized": []
+        })
+        
+        _log_to_file("meta_poster.log", f"Submitted batch {batch_id} ({len(lines)} posts)", "SUCCESS")
+        return batch_id
         
+    except requests.exceptions.RequestException as e:
+        _log_to_file("meta_poster.log", f"Batch submission failed: {str(e)}", "ERROR")
+        return None
     except Exception as e:
-        _log_to_file("meta_poster.log", f"Error generating post: {str(e)}", "ERROR")
+        _log_to_file("meta_poster.log", f"Error submitting batch: {str(e)}", "ERROR")
         return None
 
 
+def _save_batch_state(batch_file, batch_info):
+    """Atomically write a batch state file under BATCH_STATE_DIR."""
+    tmp_file = batch_file.with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(batch_info, f, indent=2)
+    os.replace(tmp_file, batch_file)
+
+
+def _poll_batches():
+    """
+    Check submitted batches and materialize completed results as .md files.
+    
+    Each result gets a filename derived from the batch and its custom_id and
+    is recorded in the batch state before the next one is written, so a poll
+    that fails partway resumes without duplicating posts.
+    
+    Returns:
+        List of generated file paths
+    """
+    generated_files = []
+    
+    if not BATCH_GENERATION or not OPENROUTER_API_KEY:
+        return generated_files
+    
+    for batch_file in BATCH_STATE_DIR.glob("batch_*.json"):
+        try:
+            with open(batch_file, "r", encoding="utf-8") as f:
+                batch_info = json.load(f)
+            
+            batch_id = batch_info["batch_id"]
+            response = _SESSION.get(f"{OPENROUTER_BASE_URL}/batches/{batch_id}", headers=_OPENROUTER_HEADERS, timeout=30)
+            response.raise_for_status()
+            batch = _json_loads(response.content)
+            status = batch.get("status")
+            
+            if status in ("failed", "expired", "cancelled"):
+                _log_to_file("meta_poster.log", f"Batch {batch_id} ended with status: {status}", "ERROR")
+                batch_file.unlink()
+                continue
+            
+            if status != "completed":
+                continue
+            
+            output_response = _SESSION.get(
+                f"{OPENROUTER_BASE_URL}/files/{batch['output_file_id']}/content",
+                headers=_OPENROUTER_HEADERS,
+                timeout=60
+            )
+            output_response.raise_for_status()
+            
+            # Name files after the submission time, not the poll, so a re-poll rewrites the same files
+            generated = batch_info["submitted"]
+            timestamp = datetime.strptime(generated, "%Y-%m-%d %H:%M:%S").strftime("%Y%m%d_%H%M%S")
+            requests_map = batch_info.get("requests", {})
+            materialized = batch_info.setdefault("materialized", [])
+            
+            for line in output_response.text.splitlines():
+                if not line.strip():
+                    continue
+                
+                item = _json_loads(line)
+                if item.get("custom_id") in materialized:
+                    continue
+                
+                request_info = requests_map.get(item.get("custom_id"))
+                body = (item.get("response") or {}).get("body") or {}
+                # Empty choices or a null message/content (refusals, tool calls) count as no content
+                choices = body.get("choices") or [{}]
+                message = choices[0].get("message") or {}
+                content = (message.get("content") or "").strip()
+                
+                if not request_info or not content:
+                    _log_to_file("meta_poster.log", f"No content in batch result: {item.get('custom_id')}", "ERROR")
+                    continue
+                
+                generated_files.append(_write_post_file(
+                    request_info["platform"],
+                    request_info["topic"],
+                    content,
+                    timestamp,
+                    generated,
+                    suffix=f"_{_generate_content_hash(batch_id + item['custom_id'])}"
+                ))
+                materialized.append(item["custom_id"])
+                _save_batch_state(batch_file, batch_info)
+            
+            batch_file.unlink()
+            _log_to_file("meta_poster.log", f"Batch {batch_id} completed", "SUCCESS")
+            
+        except Exception as e:
+            _log_to_file("meta_poster.log", f"Error polling {batch_file.name}: {str(e)}", "ERROR")
+    
+    return generated_files
+
+
 def _call_qwen_api(system_prompt, user_prompt):
     """Call Qwen/OpenRouter API to generate content."""
     try:
@@ -178,11 +486,6 @@ def _call_qwen_api(system_prompt, user_prompt):
             _log_to_file("meta_poster.log", "OPENROUTER_API_KEY not set. Cannot generate content.", "ERROR")
             return None
         
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": OPENROUTER_MODEL,
             "messages": [
@@ -193,15 +496,15 @@ def _call_qwen_api(system_prompt, user_prompt):
             "temperature": 0.7
         }
         
-        response = requests.post(
+        response = _SESSION.post(
             f"{OPENROUTER_BASE_URL}/chat/completions",
-            headers=headers,
-            json=payload,
+            headers=_OPENROUTER_JSON_HEADERS,
+            data=_json_dumps(payload),
             timeout=30
         )
         response.raise_for_status()
         
-        result = response.json()
+        result = _json_loads(response.content)
         content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
         
         return content.strip()
@@ -265,8 +568,8 @@ def post_to_facebook(content):
             "access_token": FB_PAGE_ACCESS_TOKEN
         }
         
-        response = requests.post(url, params=params, timeout=30)
-        result = response.json()
+        response = _SESSION.post(url, params=params, timeout=30)
+        result = _json_loads(response.content)
         
         if "id" in result:
             post_id = result["id"]
@@ -312,7 +615,7 @@ def post_to_instagram(content, image_url=None):
         # If no image_url provided, we'll create a simple text post
         if not image_url:
             # Create a placeholder image URL (you should provide actual images)
-            image_url = "https://via.placeholder.com/1080x1080.png?text=Post"
+            image_url = IG_PLACEHOLDER_IMAGE_URL
         
         container_params = {
             "caption": content,
@@ -321,8 +624,8 @@ def post_to_instagram(content, image_url=None):
         }
         
         # Create container
-        container_response = requests.post(container_url, params=container_params, timeout=30)
-        container_result = container_response.json()
+        container_response = _SESSION.post(container_url, params=container_params, timeout=30)
+        container_result = _json_loads(container_response.content)
         
         if "id" not in container_result:
             error_msg = container_result.get("error", {}).get("message", "Unknown error")
@@ -338,8 +641,8 @@ def post_to_instagram(content, image_url=None):
             "access_token": IG_ACCESS_TOKEN
         }
         
-        publish_response = requests.post(publish_url, params=publish_params, timeout=30)
-        publish_result = publish_response.json()
+        publish_response = _SESSION.post(publish_url, params=publish_params, timeout=30)
+        publish_result = _json_loads(publish_response.content)
         
         if "id" in publish_result:
             post_id = publish_result["id"]
@@ -358,7 +661,168 @@ def post_to_instagram(content, image_url=None):
         return None
 
 
-def post_approved_content():
+async def post_to_instagram_async(client, content, image_url=None):
+    """
+    Post content to Instagram Business account over an httpx.AsyncClient.
+    
+    Args:
+        client: httpx.AsyncClient with base_url set to GRAPH_API_URL
+        content: The caption content
+        image_url: Optional image URL (if not provided, creates text-only post)
+    
+    Returns:
+        Post ID if successful, None otherwise
+    """
+    if not IG_USER_ID or not IG_ACCESS_TOKEN:
+        _log_to_file("meta_poster.log", "Instagram credentials not configured", "ERROR")
+        return None
+    
+    if DRY_RUN:
+        _log_to_file("meta_poster.log", f"[DRY RUN] Would post to Instagram: {content[:50]}...", "INFO")
+        return "dry_run_" + _generate_content_hash(content)
+    
+    try:
+        # Step 1: Create media container
+        container_response = await client.post(f"/{IG_USER_ID}/media", params={
+            "caption": content,
+            "image_url": image_url or IG_PLACEHOLDER_IMAGE_URL,
+            "access_token": IG_ACCESS_TOKEN
+        })
+        container_result = _json_loads(container_response.content)
+        
+        if "id" not in container_result:
+            error_msg = container_result.get("error", {}).get("message", "Unknown error")
+            _log_to_file("meta_poster.log", f"Instagram container creation failed: {error_msg}", "ERROR")
+            return None
+        
+        # Step 2: Publish the container
+        publish_response = await client.post(f"/{IG_USER_ID}/media_publish", params={
+            "creation_id": container_result["id"],
+            "access_token": IG_ACCESS_TOKEN
+        })
+        publish_result = _json_loads(publish_response.content)
+        
+        if "id" in publish_result:
+            post_id = publish_result["id"]
+            _log_to_file("meta_poster.log", f"Instagram post successful. Post ID: {post_id}", "SUCCESS")
+            return post_id
+        else:
+            error_msg = publish_result.get("error", {}).get("message", "Unknown error")
+            _log_to_file("meta_poster.log", f"Instagram publish failed: {error_msg}", "ERROR")
+            return None
+            
+    except httpx.HTTPError as e:
+        _log_to_file("meta_poster.log", f"Instagram API request failed: {str(e)}", "ERROR")
+        return None
+    except Exception as e:
+        _log_to_file("meta_poster.log", f"Error posting to Instagram: {str(e)}", "ERROR")
+        return None
+
+
+async def _process_approved_file(filepath, semaphore, tick_str, ig_client=None):
+    """
+    Post a single approved META file and move it to /Done/.
+    
+    Facebook and Instagram posts for the file run concurrently; the
+    semaphore bounds how many files hit the Graph API at once. tick_str
+    is the timestamp shared by every file processed in the same tick.
+    
+    Returns:
+        Post result dict, or None if the file was skipped or failed
+    """
+    async with semaphore:
+        try:
+            # Parse frontmatter without reading the body
+            frontmatter, body_offset = _read_frontmatter_fast(filepath)
+            
+            # Check if already processed
+            if frontmatter.get("status") == "posted":
+                _log_to_file("meta_poster.log", f"Skipping already posted file: {filepath.name}", "INFO")
+                return None
+            
+            # Read the rest of the file
+            with open(filepath, "rb") as f:
+                f.seek(body_offset)
+                body = f.read().decode("utf-8").strip()
+            
+            platform = frontmatter.get("platform", "facebook")
+            topic = frontmatter.get("topic", "untitled")
+            
+            # Extract post content and hashtags
+            post_content = _extract_section(body, "Post Content")
+            hashtags = _extract_section(body, "Hashtags")
+            
+            full_content = f"{post_content}\n\n{hashtags}".strip()
+            
+            # Post to appropriate platform(s)
+            post_result = {
+                "file": filepath.name,
+                "platform": platform,
+                "timestamp": tick_str,
+                "status": "success",
+                "post_id": None
+            }
+            
+            posters = {}
+            if platform in ["facebook", "both"]:
+                posters["facebook_post_id"] = asyncio.to_thread(post_to_facebook, full_content)
+            if platform in ["instagram", "both"]:
+                if ig_client:
+                    posters["instagram_post_id"] = post_to_instagram_async(ig_client, full_content)
+                else:
+                    posters["instagram_post_id"] = asyncio.to_thread(post_to_instagram, full_content)
+            
+            post_ids = await asyncio.gather(*posters.values())
+            
+            for key, post_id in zip(posters, post_ids):
+                if post_id:
+                    post_result[key] = post_id
+                else:
+                    post_result["status"] = "partial"
+            
+            # Log the post
+            _log_post_result(post_result)
+            
+            # Move file to Done directory
+            done_path = DONE_DIR / filepath.name
+            try:
+                filepath.rename(done_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(filepath, done_path)
+            
+            # Update the file with posted status
+            _update_file_status(done_path, post_result)
+            
+            # Record activity for the Dashboard
+            _update_dashboard(post_result)
+            
+            _log_to_file("meta_poster.log", f"Processed and moved: {filepath.name}", "SUCCESS")
+            return post_result
+            
+        except Exception as e:
+            _log_to_file("meta_poster.log", f"Error processing {filepath.name}: {str(e)}", "ERROR")
+            return None
+
+
+async def _process_approved_files(approved_files):
+    """Process approved files concurrently, preserving their order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+    tick_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    if not HTTPX_AVAILABLE:
+        return await asyncio.gather(*(_process_approved_file(filepath, semaphore, tick_str) for filepath in approved_files))
+    
+    # One client per tick: Instagram's container and publish legs share its
+    # connections (multiplexed when HTTP/2 is available)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, base_url=GRAPH_API_URL, timeout=30) as ig_client:
+        return await asyncio.gather(
+            *(_process_approved_file(filepath, semaphore, tick_str, ig_client) for filepath in approved_files)
+        )
+
+
+async def post_approved_content_async():
     """
     Watch /Approved/ for META_*.md files and post them.
     
@@ -369,76 +833,22 @@ def post_approved_content():
     
     try:
         # Find all META_*.md files in Approved directory
-        approved_files = list(APPROVED_DIR.glob("META_*.md"))
+        with os.scandir(APPROVED_DIR) as entries:
+            approved_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.startswith("META_") and entry.name.endswith(".md")
+                and entry.is_file(follow_symlinks=False)
+            ]
         
         if not approved_files:
             _log_to_file("meta_poster.log", "No approved META files to process", "INFO")
             return posted_files
         
-        for filepath in approved_files:
-            try:
-                # Read the file
-                with open(filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                # Parse frontmatter
-                frontmatter, body = _parse_frontmatter(content)
-                
-                # Check if already processed
-                if frontmatter.get("status") == "posted":
-                    _log_to_file("meta_poster.log", f"Skipping already posted file: {filepath.name}", "INFO")
-                    continue
-                
-                platform = frontmatter.get("platform", "facebook")
-                topic = frontmatter.get("topic", "untitled")
-                
-                # Extract post content and hashtags
-                post_content = _extract_section(body, "Post Content")
-                hashtags = _extract_section(body, "Hashtags")
-                
-                full_content = f"{post_content}\n\n{hashtags}".strip()
-                
-                # Post to appropriate platform(s)
-                post_result = {
-                    "file": filepath.name,
-                    "platform": platform,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "status": "success",
-                    "post_id": None
-                }
-                
-                if platform in ["facebook", "both"]:
-                    fb_post_id = post_to_facebook(full_content)
-                    if fb_post_id:
-                        post_result["facebook_post_id"] = fb_post_id
-                    else:
-                        post_result["status"] = "partial"
-                
-                if platform in ["instagram", "both"]:
-                    ig_post_id = post_to_instagram(full_content)
-                    if ig_post_id:
-                        post_result["instagram_post_id"] = ig_post_id
-                    else:
-                        post_result["status"] = "partial"
-                
-                # Log the post
-                _log_post_result(post_result)
-                
-                # Move file to Done directory
-                done_path = DONE_DIR / filepath.name
-                shutil.move(str(filepath), str(done_path))
-                
-                # Update the file with posted status
-                _update_file_status(done_path, post_result)
-                
-                # Update Dashboard
-                _update_dashboard(post_result)
-                
-                posted_files.append(post_result)
-                _log_to_file("meta_poster.log", f"Processed and moved: {filepath.name}", "SUCCESS")
-                
-            except Exception as e:
-                _log_to_file("meta_poster.log", f"Error processing {filepath.name}: {str(e)}", "ERROR")
+        results = await _process_approved_files(approved_files)
+        posted_files = [result for result in results if result]
+        
+        if posted_files:
+            render_dashboard()
         
         return posted_files
         
@@ -447,45 +857,72 @@ def post_approved_content():
         return posted_files
 
 
+def post_approved_content():
+    """
+    Watch /Approved/ for META_*.md files and post them.
+    
+    Synchronous entry point for post_approved_content_async().
+    
+    Returns:
+        List of posted file info dicts
+    """
+    return asyncio.run(post_approved_content_async())
+
+
 def _parse_frontmatter(content):
     """Parse YAML frontmatter from markdown content."""
-    lines = content.strip().split("\n")
+    match = _FRONTMATTER_RE.match(content.strip())
     
-    if not lines[0].strip() == "---":
+    if not match:
         return {}, content
     
+    frontmatter = {key.strip(): value.strip() for key, value in _FRONTMATTER_LINE_RE.findall(match.group(1))}
+    body = match.group(2).strip()
+    return frontmatter, body
+
+
+def _read_frontmatter_fast(filepath):
+    """
+    Read only the frontmatter block at the top of a markdown file.
+    
+    Returns:
+        Tuple of (frontmatter dict, byte offset where the body starts).
+        Files without a closed frontmatter block return ({}, 0).
+    """
     frontmatter = {}
-    body_start = 0
     
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip() == "---":
-            body_start = i + 1
-            break
-        if ":" in line:
-            key, value = line.split(":", 1)
-            frontmatter[key.strip()] = value.strip()
+    with open(filepath, "rb") as f:
+        line = f.readline()
+        while line and not line.strip():
+            line = f.readline()
+        
+        if line.strip() != b"---":
+            return {}, 0
+        
+        for line in f:
+            text = line.decode("utf-8").strip()
+            if text == "---":
+                return frontmatter, f.tell()
+            if ":" in text:
+                key, value = text.split(":", 1)
+                frontmatter[key.strip()] = value.strip()
     
-    body = "\n".join(lines[body_start:]).strip()
-    return frontmatter, body
+    return {}, 0
+
+
+@functools.lru_cache(maxsize=32)
+def _section_regex(section_name):
+    """Compile (once per name) the pattern matching a section's body."""
+    return re.compile(
+        rf"^[ \t]*## {re.escape(section_name)}[^\n]*(?:\n|\Z)(.*?)(?=^[ \t]*## |\Z)",
+        re.DOTALL | re.MULTILINE
+    )
 
 
 def _extract_section(content, section_name):
     """Extract content under a specific section header."""
-    lines = content.split("\n")
-    in_section = False
-    section_content = []
-    
-    for line in lines:
-        if line.strip().startswith(f"## {section_name}"):
-            in_section = True
-            continue
-        elif line.strip().startswith("## "):
-            if in_section:
-                break
-        elif in_section:
-            section_content.append(line)
-    
-    return "\n".join(section_content).strip()
+    match = _section_regex(section_name).search(content)
+    return match.group(1).strip() if match else ""
 
 
 def _log_post_result(result):
@@ -505,14 +942,21 @@ def _update_file_status(filepath, post_result):
             content = f.read()
         
         # Update frontmatter status
-        content = content.replace("status: pending_approval", "status: posted")
-        content = content.replace("status: posted", f"status: posted\nposted_at: {post_result['timestamp']}")
+        frontmatter, body = _parse_frontmatter(content)
+        frontmatter["status"] = "posted"
+        frontmatter["posted_at"] = post_result["timestamp"]
+        
+        frontmatter_lines = "\n".join(f"{key}: {value}" for key, value in frontmatter.items())
+        content = f"---\n{frontmatter_lines}\n---\n{body}\n"
         
         # Add post IDs
+        posted_lines = []
         if "facebook_post_id" in post_result:
-            content += f"\n\n## Posted\n- Facebook Post ID: {post_result['facebook_post_id']}"
+            posted_lines.append(f"- Facebook Post ID: {post_result['facebook_post_id']}")
         if "instagram_post_id" in post_result:
-            content += f"\n- Instagram Post ID: {post_result['instagram_post_id']}"
+            posted_lines.append(f"- Instagram Post ID: {post_result['instagram_post_id']}")
+        if posted_lines:
+            content += "\n## Posted\n" + "\n".join(posted_lines) + "\n"
         
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
@@ -522,39 +966,75 @@ def _update_file_status(filepath, post_result):
 
 
 def _update_dashboard(post_result):
-    """Update Dashboard.md with recent activity."""
+    """Append a post result to the activity log rendered into Dashboard.md."""
+    try:
+        line = _json_dumps(post_result) + b"\n"
+        fd = os.open(ACTIVITY_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+            
+    except Exception as e:
+        _log_to_file("meta_poster.log", f"Error recording dashboard activity: {str(e)}", "ERROR")
+
+
+def _tail_lines(path, count, block_size=8192):
+    """Last `count` non-empty lines of a file, read backwards from the end in blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # One extra newline so the oldest wanted line is known to be complete
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if position > 0:
+        lines = lines[1:]  # Partial line cut by the block boundary
+    lines = [line for line in lines if line.strip()]
+    return [line.decode("utf-8") for line in lines[-count:]]
+
+
+def render_dashboard():
+    """
+    Render the most recent social media activity into Dashboard.md.
+    
+    Only the last DASHBOARD_ACTIVITY_LIMIT entries of the activity log are
+    read (backwards from the end of the file), and the section is replaced rather than prepended to, so the
+    cost stays flat no matter how much history has accumulated.
+    """
     try:
         dashboard_path = BASE_DIR / "Dashboard.md"
         
+        recent = []
+        if ACTIVITY_LOG.exists():
+            recent = _tail_lines(ACTIVITY_LOG, DASHBOARD_ACTIVITY_LIMIT)
+        
+        # Newest first
+        entries = []
+        for line in reversed(recent):
+            post_result = _json_loads(line)
+            platform = post_result.get("platform", "unknown")
+            status = post_result.get("status", "unknown")
+            timestamp = post_result.get("timestamp", "N/A")
+            entries.append(f"- [{timestamp}] Posted to {platform.upper()} | Status: {status}")
+        
+        section = "## Social Media Activity\n" + "\n".join(entries) + "\n\n"
+        
         # Create dashboard if it doesn't exist
         if not dashboard_path.exists():
-            dashboard_content = "# Dashboard\n\n## Recent Activity\n\n"
+            dashboard_content = "# Dashboard\n\n"
         else:
             with open(dashboard_path, "r", encoding="utf-8") as f:
                 dashboard_content = f.read()
         
-        # Create activity entry
-        platform = post_result.get("platform", "unknown")
-        status = post_result.get("status", "unknown")
-        timestamp = post_result.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        activity_entry = f"- [{timestamp}] Posted to {platform.upper()} | Status: {status}\n"
-        
-        # Insert after "## Recent Activity" header
-        if "## Recent Activity" in dashboard_content:
-            lines = dashboard_content.split("\n")
-            new_lines = []
-            inserted = False
-            
-            for line in lines:
-                new_lines.append(line)
-                if line.strip() == "## Recent Activity" and not inserted:
-                    new_lines.append(activity_entry)
-                    inserted = True
-            
-            dashboard_content = "\n".join(new_lines)
+        if _DASHBOARD_SECTION_RE.search(dashboard_content):
+            dashboard_content = _DASHBOARD_SECTION_RE.sub(lambda _: section, dashboard_content, count=1)
         else:
-            dashboard_content += f"\n## Recent Activity\n{activity_entry}"
+            dashboard_content = dashboard_content.rstrip("\n") + "\n\n" + section
         
         with open(dashboard_path, "w", encoding="utf-8") as f:
             f.write(dashboard_content)
@@ -580,25 +1060,34 @@ def get_post_summary():
             "generated_at": today.strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        # Fetch Facebook posts
-        if FB_PAGE_ID and FB_PAGE_ACCESS_TOKEN:
-            fb_posts = _fetch_facebook_posts(seven_days_ago)
-            if fb_posts:
-                summary_data["facebook"]["posts"] = fb_posts
-                for post in fb_posts:
-                    summary_data["facebook"]["total_likes"] += post.get("likes", 0)
-                    summary_data["facebook"]["total_comments"] += post.get("comments", 0)
-                    summary_data["facebook"]["total_shares"] += post.get("shares", 0)
-        
-        # Fetch Instagram posts
-        if IG_USER_ID and IG_ACCESS_TOKEN:
-            ig_posts = _fetch_instagram_posts(seven_days_ago)
-            if ig_posts:
-                summary_data["instagram"]["posts"] = ig_posts
-                for post in ig_posts:
-                    summary_data["instagram"]["total_likes"] += post.get("likes", 0)
-                    summary_data["instagram"]["total_comments"] += post.get("comments", 0)
-                    summary_data["instagram"]["total_saves"] += post.get("saves", 0)
+        # Fetch both platforms concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            fb_future = executor.submit(_fetch_facebook_posts, seven_days_ago) if FB_PAGE_ID and FB_PAGE_ACCESS_TOKEN else None
+            ig_future = executor.submit(_fetch_instagram_posts, seven_days_ago) if IG_USER_ID and IG_ACCESS_TOKEN else None
+            fb_posts = fb_future.result() if fb_future else []
+            ig_posts = ig_future.result() if ig_future else []
+        
+        # Facebook totals (one pass over the posts)
+        if fb_posts:
+            likes = comments = shares = 0
+            for post in fb_posts:
+                likes += post["likes"]
+                comments += post["comments"]
+                shares += post["shares"]
+            summary_data["facebook"].update(
+                posts=fb_posts, total_likes=likes, total_comments=comments, total_shares=shares
+            )
+        
+        # Instagram totals (one pass over the posts)
+        if ig_posts:
+            likes = comments = saves = 0
+            for post in ig_posts:
+                likes += post["likes"]
+                comments += post["comments"]
+                saves += post["saves"]
+            summary_data["instagram"].update(
+                posts=ig_posts, total_likes=likes, total_comments=comments, total_saves=saves
+            )
         
         # Generate summary file
         summary_path = _generate_summary_file(summary_data)
@@ -611,6 +1100,23 @@ def get_post_summary():
         return None
 
 
+def _fetch_graph_pages(url, params):
+    """Yield items from a Graph API edge, following the 'after' cursor."""
+    params = dict(params)
+    
+    for _ in range(GRAPH_MAX_PAGES):
+        response = _SESSION.get(url, params=params, timeout=30)
+        result = _json_loads(response.content)
+        
+        yield from result.get("data", [])
+        
+        paging = result.get("paging", {})
+        after = paging.get("cursors", {}).get("after")
+        if not paging.get("next") or not after:
+            break
+        params["after"] = after
+
+
 def _fetch_facebook_posts(since_date):
     """Fetch Facebook posts with engagement metrics."""
     try:
@@ -619,14 +1125,11 @@ def _fetch_facebook_posts(since_date):
             "fields": "id,message,created_time,permalink_url,likes.summary(true),comments.summary(true),shares",
             "since": since_date.strftime("%Y-%m-%d"),
             "access_token": FB_PAGE_ACCESS_TOKEN,
-            "limit": 50
+            "limit": GRAPH_PAGE_SIZE
         }
         
-        response = requests.get(url, params=params, timeout=30)
-        result = response.json()
-        
         posts = []
-        for post in result.get("data", []):
+        for post in _fetch_graph_pages(url, params):
             post_data = {
                 "id": post.get("id"),
                 "message": post.get("message", "")[:100],
@@ -653,14 +1156,11 @@ def _fetch_instagram_posts(since_date):
             "fields": "id,caption,timestamp,permalink,like_count,comments_count,saved",
             "since": since_date.strftime("%Y-%m-%d"),
             "access_token": IG_ACCESS_TOKEN,
-            "limit": 50
+            "limit": GRAPH_PAGE_SIZE
         }
         
-        response = requests.get(url, params=params, timeout=30)
-        result = response.json()
-        
         posts = []
-        for post in result.get("data", []):
+        for post in _fetch_graph_pages(url, params):
             post_data = {
                 "id": post.get("id"),
                 "caption": post.get("caption", "")[:100],
@@ -688,7 +1188,7 @@ def _generate_summary_file(summary_data):
         fb_data = summary_data.get("facebook", {})
         ig_data = summary_data.get("instagram", {})
         
-        content = f"""# Social Media Summary
+        parts = [f"""# Social Media Summary
 
 **Generated:** {summary_data.get("generated_at", "N/A")}
 
@@ -711,17 +1211,19 @@ def _generate_summary_file(summary_data):
 
 | Date | Message | Likes | Comments | Shares |
 |------|---------|-------|----------|--------|
-"""
+"""]
         
         for post in fb_data.get("posts", [])[:10]:
             date = post.get("created_time", "N/A")[:10] if post.get("created_time") else "N/A"
-            message = post.get("message", "No content")[:50] + "..." if len(post.get("message", "")) > 50 else post.get("message", "No content")
-            content += f"| {date} | {message} | {post.get('likes', 0)} | {post.get('comments', 0)} | {post.get('shares', 0)} |\n"
+            message = post.get("message", "No content")
+            if len(message) > 50:
+                message = message[:50] + "..."
+            parts.append(f"| {date} | {message} | {post.get('likes', 0)} | {post.get('comments', 0)} | {post.get('shares', 0)} |\n")
         
         if not fb_data.get("posts"):
-            content += "| - | No posts in this period | - | - | - |\n"
+            parts.append("| - | No posts in this period | - | - | - |\n")
         
-        content += f"""
+        parts.append(f"""
 ---
 
 ## Instagram Business
@@ -739,24 +1241,25 @@ def _generate_summary_file(summary_data):
 
 | Date | Caption | Likes | Comments | Saves |
 |------|---------|-------|----------|-------|
-"""
+""")
         
         for post in ig_data.get("posts", [])[:10]:
             date = post.get("timestamp", "N/A")[:10] if post.get("timestamp") else "N/A"
-            caption = post.get("caption", "No content")[:50] + "..." if len(post.get("caption", "")) > 50 else post.get("caption", "No content")
-            content += f"| {date} | {caption} | {post.get('likes', 0)} | {post.get('comments', 0)} | {post.get('saves', 0)} |\n"
+            caption = post.get("caption", "No content")
+            if len(caption) > 50:
+                caption = caption[:50] + "..."
+            parts.append(f"| {date} | {caption} | {post.get('likes', 0)} | {post.get('comments', 0)} | {post.get('saves', 0)} |\n")
         
         if not ig_data.get("posts"):
-            content += "| - | No posts in this period | - | - | - |\n"
+            parts.append("| - | No posts in this period | - | - | - |\n")
         
-        content += """
+        parts.append("""
 ---
 
 *Report generated by meta_poster.py*
-"""
+""")
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        filepath.write_text("".join(parts), encoding="utf-8")
         
         return str(filepath)
         
@@ -765,21 +1268,58 @@ def _generate_summary_file(summary_data):
         return None
 
 
+async def _run_job(job):
+    """Run a scheduled job, awaiting coroutines and threading sync calls."""
+    try:
+        if asyncio.iscoroutinefunction(job):
+            await job()
+        else:
+            await asyncio.to_thread(job)
+    except Exception as e:
+        _log_to_file("meta_poster.log", f"Scheduled job {job.__name__} failed: {str(e)}", "ERROR")
+
+
+async def _run_every(interval_seconds, job):
+    """Run a job every interval_seconds."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await _run_job(job)
+
+
+async def _run_daily_at(hour, minute, job):
+    """Run a job once a day at the given local time."""
+    while True:
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+        await _run_job(job)
+
+
+async def _scheduler_main():
+    """Run all scheduled jobs concurrently on one event loop."""
+    jobs = [
+        # Check for approved content every 15 minutes
+        _run_every(15 * 60, post_approved_content_async),
+        # Generate summary daily at 9 AM
+        _run_daily_at(9, 0, get_post_summary)
+    ]
+    if BATCH_GENERATION:
+        # Materialize completed batch generations every 10 minutes
+        jobs.append(_run_every(10 * 60, _poll_batches))
+    await asyncio.gather(*jobs)
+
+
 def run_scheduler():
     """Run the scheduler to check for approved content periodically."""
     _log_to_file("meta_poster.log", "Starting Meta Poster scheduler", "INFO")
-    
-    # Check for approved content every 15 minutes
-    schedule.every(15).minutes.do(post_approved_content)
-    
-    # Generate summary daily at 9 AM
-    schedule.every().day.at("09:00").do(get_post_summary)
-    
     _log_to_file("meta_poster.log", "Scheduler configured: checking every 15 minutes", "INFO")
     
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    try:
+        asyncio.run(_scheduler_main())
+    except KeyboardInterrupt:
+        _log_to_file("meta_poster.log", "Meta Poster scheduler stopped", "INFO")
 
 
 # Example usage / testing
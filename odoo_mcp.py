@@ -2,13 +2,38 @@
 # Or use Docker: docker run -p 8069:8069 odoo:17
 
 import os
+import re
+import sys
 import json
+import time
+import hashlib
+import functools
+import asyncio
+import importlib.util
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 
+# Optional: orjson for faster JSON-RPC encoding/decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: httpx for concurrent, non-blocking Odoo fetches
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP2_AVAILABLE = False
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -21,16 +46,232 @@ ODOO_DB = os.getenv("ODOO_DB", "")
 ODOO_USER = os.getenv("ODOO_USER", "")
 ODOO_PASSWORD = os.getenv("ODOO_PASSWORD", "")
 
+# Default for create_invoice_draft when dry_run isn't passed explicitly
+_DRY_RUN_DEFAULT = os.getenv("DRY_RUN", "false").strip().lower() in ("1", "true", "yes")
+
 # Vault path for saving summaries
 VAULT_PATH = Path(__file__).parent / "Accounting"
 
+# Vault summary report layout, filled with str.format_map
+_SUMMARY_TEMPLATE = """# Financial Summary - {period}
+
+**Generated:** {generated}
+
+---
+
+## Revenue Overview
+
+| Metric | Value |
+|--------|-------|
+| Total Revenue | ${total_revenue:,.2f} |
+| Invoice Count | {invoice_count} |
+| Avg Invoice Value | ${avg_invoice:,.2f} |
+
+---
+
+## Expenses Overview
+
+| Metric | Value |
+|--------|-------|
+| Total Expenses | ${total_expenses:,.2f} |
+
+### Expenses by Category
+
+| Category | Total | Count | Vendors |
+|----------|-------|-------|---------|
+{category_rows}
+---
+
+## Profit & Loss
+
+| Metric | Value |
+|--------|-------|
+| Total Revenue | ${total_revenue:,.2f} |
+| Total Expenses | ${total_expenses:,.2f} |
+| **Net Profit** | **${profit:,.2f}** |
+| Profit Margin | {profit_margin:.1f}% |
+
+---
+
+## Overdue Invoices
+
+| Metric | Value |
+|--------|-------|
+| Count | {overdue_count} |
+| Total Amount Due | ${overdue_amount:,.2f} |
+
+### Overdue Invoice Details
+
+| Invoice | Client | Amount Due | Days Overdue |
+|---------|--------|------------|--------------|
+{overdue_rows}
+---
+
+*Report generated by odoo_mcp.py*
+"""
+_CATEGORY_ROW = "| {category} | ${total:,.2f} | {count} | {vendors} |\n"
+_OVERDUE_ROW = "| {name} | {client} | ${due:,.2f} | {days} |\n"
+_NO_OVERDUE_ROW = "| - | No overdue invoices | - | - |\n"
+
+# Console verbosity: 0 = errors only, 1 = progress and results (default)
+_LOG_LEVEL = int(os.getenv("ODOO_MCP_LOG", "1"))
+
+# Authenticated uid cache, refreshed after ODOO_AUTH_TTL seconds or on session expiry
+_AUTH_CACHE = {"uid": None, "ts": 0.0}
+_AUTH_TTL = int(os.getenv("ODOO_AUTH_TTL", "1800"))
+_SESSION_EXPIRED_CODE = 100
+
+# Stock Odoo /jsonrpc rejects JSON-RPC batch arrays, so batching is opt-in
+# (for servers or proxies that accept them) and switched off after the first
+# reply that isn't a batch
+_BATCH_STATE = {"enabled": os.getenv("ODOO_JSONRPC_BATCH", "false").strip().lower() in ("1", "true", "yes")}
+
+# Records fetched per request when streaming large result sets
+_PAGE_SIZE = 500
+
+# Model methods that only read, so replaying them after a gateway error is harmless
+_READ_ONLY_METHODS = frozenset([
+    "search_read", "read", "search", "search_count", "read_group",
+    "fields_get", "name_get", "name_search", "default_get"
+])
+
 
-def _make_jsonrpc_request(endpoint, params, method="call"):
+def _new_session(status_forcelist):
+    """Keep-alive requests session that retries refused connections and the given statuses."""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+    for scheme in ("http://", "https://"):
+        session.mount(scheme, HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # Read timeouts are never retried since a create call may already have committed
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=status_forcelist,
+                allowed_methods=frozenset(["POST"])
+            )
+        ))
+    return session
+
+
+# Shared HTTP sessions so every JSON-RPC call reuses a keep-alive connection.
+# Reads also retry gateway/server errors; writes don't, since a 502/504 from a
+# proxy can arrive after Odoo has already committed the create or write.
+_SESSION = _new_session([500, 502, 503, 504])
+_WRITE_SESSION = _new_session([])
+
+
+def _is_write(params):
+    """True if the call may change data in Odoo (any object method not known to be read-only)."""
+    if params.get("service") != "object":
+        return False
+    args = params.get("args") or []
+    return len(args) < 5 or args[4] not in _READ_ONLY_METHODS
+
+
+class OdooRPCError(Exception):
+    """
+    Failed JSON-RPC call, returned instead of a result (or raised by the
+    paged readers).
+    
+    Falsy, so existing `if not result` checks still treat it as a failure,
+    while callers that care can tell a network failure ("network") from an
+    error reported by Odoo ("api") or rejected credentials ("auth") rather
+    than an empty result.
     """
-    Internal helper to make JSON-RPC requests to Odoo.
+    
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+        self.message = message
+    
+    def __bool__(self):
+        return False
+    
+    def __repr__(self):
+        return f"OdooRPCError({self.kind!r}, {self.message!r})"
+
+
+def _log(level, color, msg):
+    """
+    Print a console message if it is within ODOO_MCP_LOG.
+    
+    Level 0 messages are errors and go to stderr so stdout stays clean
+    for anything consuming this module's output.
+    """
+    if level > _LOG_LEVEL:
+        return
+    print(f"{color}{msg}", file=sys.stderr if level == 0 else sys.stdout)
+
+
+def _json_dumps(obj):
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _object_params(uid, query):
+    """
+    Build stateless `object.execute_kw` params for a model query.
+    
+    Args:
+        uid: Authenticated user ID
+        query: Dict with "model", optional "method" (default search_read) and
+            either "args"/"kwargs" or a "domain" plus keyword options such as
+            fields, limit, offset, order or groupby
+    """
+    query = dict(query)
+    model = query.pop("model")
+    method = query.pop("method", "search_read")
+    
+    if "args" in query:
+        args = query.pop("args")
+        kwargs = query.pop("kwargs", {})
+    else:
+        args = [query.pop("domain", [])]
+        kwargs = query
+    
+    return {
+        "service": "object",
+        "method": "execute_kw",
+        "args": [ODOO_DB, uid, ODOO_PASSWORD, model, method, args, kwargs]
+    }
+
+
+def _uid_rejected(error, params):
+    """True if an object call failed because the cached uid/credentials are stale."""
+    if params.get("service") != "object":
+        return False
+    error_name = (error.get("data") or {}).get("name", "")
+    return error.get("code") == _SESSION_EXPIRED_CODE or error_name.endswith("AccessDenied")
+
+
+def _with_uid(params, uid):
+    """Return object call params with the uid argument replaced."""
+    args = list(params["args"])
+    args[1] = uid
+    return {**params, "args": args}
+
+
+def _make_jsonrpc_request(params, method="call", _retried=False):
+    """
+    Internal helper to make JSON-RPC requests to Odoo's stateless /jsonrpc endpoint.
+    
+    Returns:
+        The call's result, or an OdooRPCError if the request or the call failed
     """
     url = f"{ODOO_URL}/jsonrpc"
-    headers = {"Content-Type": "application/json"}
     
     payload = {
         "jsonrpc": "2.0",
@@ -40,58 +281,220 @@ def _make_jsonrpc_request(endpoint, params, method="call"):
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        session = _WRITE_SESSION if _is_write(params) else _SESSION
+        response = session.post(url, data=_json_dumps(payload), timeout=(5, 30))
         response.raise_for_status()
-        result = response.json()
+        result = _json_loads(response.content)
         
         if "error" in result:
-            print(f"{Fore.RED}[ERROR] Odoo API Error: {result['error'].get('message', 'Unknown error')}")
-            return None
+            # Stale uid: re-authenticate once and replay the call
+            if not _retried and _uid_rejected(result["error"], params):
+                uid = _get_uid(force=True)
+                if uid:
+                    return _make_jsonrpc_request(_with_uid(params, uid), method, _retried=True)
+            message = result["error"].get("message", "Unknown error")
+            _log(0, Fore.RED, f"[ERROR] Odoo API Error: {message}")
+            return OdooRPCError("api", message)
         
         return result.get("result")
     except requests.exceptions.ConnectionError:
-        print(f"{Fore.RED}[ERROR] Connection failed to Odoo at {ODOO_URL}")
-        return None
+        _log(0, Fore.RED, f"[ERROR] Connection failed to Odoo at {ODOO_URL}")
+        return OdooRPCError("network", f"Connection failed to Odoo at {ODOO_URL}")
     except requests.exceptions.Timeout:
-        print(f"{Fore.RED}[ERROR] Request timed out connecting to Odoo")
+        _log(0, Fore.RED, "[ERROR] Request timed out connecting to Odoo")
+        return OdooRPCError("network", "Request timed out")
+    except requests.exceptions.RequestException as e:
+        _log(0, Fore.RED, f"[ERROR] Odoo request failed: {str(e)}")
+        return OdooRPCError("network", str(e))
+    except ValueError:
+        _log(0, Fore.RED, "[ERROR] Odoo returned an invalid JSON-RPC response")
+        return OdooRPCError("api", "Invalid JSON-RPC response")
+
+
+def _make_jsonrpc_batch(params_list, method="call"):
+    """
+    Send several JSON-RPC calls to Odoo in a single HTTP round trip.
+    
+    Returns:
+        List of results in the same order as params_list (an OdooRPCError
+        for calls that failed), or None if batching is disabled or the server
+        did not answer with a batch.
+    """
+    if not _BATCH_STATE["enabled"]:
         return None
-    except Exception as e:
-        print(f"{Fore.RED}[ERROR] Unexpected error: {str(e)}")
+    
+    url = f"{ODOO_URL}/jsonrpc"
+    
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+        for request_id, params in enumerate(params_list)
+    ]
+    
+    try:
+        response = _SESSION.post(url, data=_json_dumps(payload), timeout=(5, 30))
+        response.raise_for_status()
+        batch = _json_loads(response.content)
+    except requests.exceptions.RequestException as e:
+        _log(0, Fore.RED, f"[ERROR] Odoo batch request failed: {str(e)}")
+        return None
+    except ValueError:
+        return None
+    
+    if not isinstance(batch, list):
+        _log(1, Fore.YELLOW, "[INFO] Odoo does not support JSON-RPC batches; sending queries one by one")
+        _BATCH_STATE["enabled"] = False
         return None
+    
+    results = [OdooRPCError("api", "No response in batch")] * len(params_list)
+    for item in sorted(batch, key=lambda item: item.get("id", -1)):
+        request_id = item.get("id")
+        if not (isinstance(request_id, int) and 0 <= request_id < len(results)):
+            continue
+        if "error" in item:
+            message = item["error"].get("message", "Unknown error")
+            _log(0, Fore.RED, f"[ERROR] Odoo API Error: {message}")
+            results[request_id] = OdooRPCError("api", message)
+        else:
+            results[request_id] = item.get("result")
+    
+    return results
+
+
+
+async def _make_jsonrpc_request_async(client, params, method="call", _retried=False):
+    """
+    Async counterpart of _make_jsonrpc_request over an httpx.AsyncClient.
+    
+    Args:
+        client: httpx.AsyncClient with base_url set to ODOO_URL
+        params: JSON-RPC params
+        method: JSON-RPC method name
+    """
+    payload = {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params,
+        "id": 1
+    }
+    
+    try:
+        response = await client.post("/jsonrpc", content=_json_dumps(payload))
+        response.raise_for_status()
+        result = _json_loads(response.content)
+        
+        if "error" in result:
+            if not _retried and _uid_rejected(result["error"], params):
+                uid = await asyncio.to_thread(_get_uid, True)
+                if uid:
+                    return await _make_jsonrpc_request_async(client, _with_uid(params, uid), method, _retried=True)
+            message = result["error"].get("message", "Unknown error")
+            _log(0, Fore.RED, f"[ERROR] Odoo API Error: {message}")
+            return OdooRPCError("api", message)
+        
+        return result.get("result")
+    except httpx.ConnectError:
+        _log(0, Fore.RED, f"[ERROR] Connection failed to Odoo at {ODOO_URL}")
+        return OdooRPCError("network", f"Connection failed to Odoo at {ODOO_URL}")
+    except httpx.TimeoutException:
+        _log(0, Fore.RED, "[ERROR] Request timed out connecting to Odoo")
+        return OdooRPCError("network", "Request timed out")
+    except httpx.HTTPError as e:
+        _log(0, Fore.RED, f"[ERROR] Odoo request failed: {str(e)}")
+        return OdooRPCError("network", str(e))
+    except ValueError:
+        _log(0, Fore.RED, "[ERROR] Odoo returned an invalid JSON-RPC response")
+        return OdooRPCError("api", "Invalid JSON-RPC response")
+
+
+def _async_client():
+    """Create an httpx.AsyncClient for Odoo, pooled for the concurrent summary queries."""
+    return httpx.AsyncClient(
+        base_url=ODOO_URL,
+        headers={"Content-Type": "application/json"},
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        # Retries failed connection attempts only, like the sync session
+        transport=httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+        )
+    )
+
+
+async def _query_async(client, query):
+    """
+    Run one model query without blocking the event loop.
+    
+    Uses the given httpx client, or the shared requests session in a worker
+    thread when httpx is not installed.
+    """
+    uid = await asyncio.to_thread(_get_uid)
+    if not uid:
+        return uid
+    
+    params = _object_params(uid, query)
+    if client is None:
+        return await asyncio.to_thread(_make_jsonrpc_request, params)
+    return await _make_jsonrpc_request_async(client, params)
 
 
 def authenticate():
     """
     Authenticate with Odoo and return the user ID (uid).
-    Returns None if authentication fails.
+    
+    Returns:
+        The uid, or an OdooRPCError (falsy) saying whether the credentials
+        were rejected ("auth") or Odoo could not be reached ("network")
     """
     try:
+        # Stateless login: common.authenticate returns the uid (or False)
+        # without opening a web session
         params = {
-            "db": ODOO_DB,
-            "username": ODOO_USER,
-            "password": ODOO_PASSWORD
+            "service": "common",
+            "method": "authenticate",
+            "args": [ODOO_DB, ODOO_USER, ODOO_PASSWORD, {}]
         }
         
-        result = _make_jsonrpc_request("/web/session/authenticate", params, method="call")
-        
-        if result and "uid" in result:
-            uid = result["uid"]
-            if uid:
-                print(f"{Fore.GREEN}[SUCCESS] Authenticated with Odoo. UID: {uid}")
-                return uid
-            else:
-                print(f"{Fore.RED}[ERROR] Authentication failed - invalid credentials")
-                _alert_auth_error("Authentication failed - invalid credentials")
-                return None
+        result = _make_jsonrpc_request(params)
+        
+        if isinstance(result, OdooRPCError):
+            _alert_auth_error(result.message)
+            return result
+        elif result is False:
+            _log(0, Fore.RED, "[ERROR] Authentication failed - invalid credentials")
+            _alert_auth_error("Authentication failed - invalid credentials")
+            return OdooRPCError("auth", "Invalid credentials")
+        elif isinstance(result, int) and result:
+            _log(1, Fore.GREEN, f"[SUCCESS] Authenticated with Odoo. UID: {result}")
+            return result
         else:
-            print(f"{Fore.RED}[ERROR] No UID returned from authentication")
+            _log(0, Fore.RED, "[ERROR] No UID returned from authentication")
             _alert_auth_error("No UID returned from authentication")
-            return None
+            return OdooRPCError("api", "No UID returned from authentication")
             
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Authentication exception: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Authentication exception: {str(e)}")
         _alert_auth_error(f"Authentication exception: {str(e)}")
-        return None
+        return OdooRPCError("api", str(e))
+
+
+def _get_uid(force=False):
+    """
+    Return the authenticated user ID, reusing the cached one until it expires.
+    
+    Args:
+        force: Re-authenticate even if a cached uid is still valid
+    
+    Returns:
+        The uid, or the OdooRPCError from authenticate()
+    """
+    if not force and _AUTH_CACHE["uid"] and time.monotonic() - _AUTH_CACHE["ts"] < _AUTH_TTL:
+        return _AUTH_CACHE["uid"]
+    
+    uid = authenticate()
+    _AUTH_CACHE["uid"] = uid
+    _AUTH_CACHE["ts"] = time.monotonic()
+    return uid
 
 
 def _alert_auth_error(error_message):
@@ -123,9 +526,9 @@ Ensure the Odoo server is running and accessible.
         with open(alert_file, "w") as f:
             f.write(content)
         
-        print(f"{Fore.YELLOW}[ALERT] Auth error logged to {alert_file}")
+        _log(1, Fore.YELLOW, f"[ALERT] Auth error logged to {alert_file}")
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Failed to write auth error alert: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Failed to write auth error alert: {str(e)}")
 
 
 def get_invoices(state="open"):
@@ -139,7 +542,7 @@ def get_invoices(state="open"):
         List of invoices with: id, name, partner_name, amount_total, state, invoice_date_due
     """
     try:
-        uid = authenticate()
+        uid = _get_uid()
         if not uid:
             return None
         
@@ -151,45 +554,37 @@ def get_invoices(state="open"):
         # Define fields to retrieve
         fields_list = ["id", "name", "partner_id", "amount_total", "state", "invoice_date_due"]
         
-        params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
+        query = {
             "model": "account.move",
             "domain": domain,
-            "fields": fields_list
+            "fields": fields_list,
+            "order": "id"
         }
         
-        result = _make_jsonrpc_request("/web/dataset/search_read", params, method="call")
-        
-        if not result:
-            print(f"{Fore.YELLOW}[WARNING] No invoices found with state='{state}'")
-            return []
-        
-        invoices = []
-        for inv in result.get("records", []):
-            # Handle partner_id which may be a tuple [id, name] or just id
-            partner_name = ""
-            if inv.get("partner_id"):
-                if isinstance(inv["partner_id"], list) and len(inv["partner_id"]) >= 2:
-                    partner_name = inv["partner_id"][1]
-                else:
-                    partner_name = str(inv["partner_id"])
-            
-            invoices.append({
+        invoices = [
+            {
                 "id": inv.get("id"),
                 "name": inv.get("name", ""),
-                "partner_name": partner_name,
+                "partner_name": _partner_name(inv.get("partner_id")),
                 "amount_total": inv.get("amount_total", 0.0),
                 "state": inv.get("state", ""),
                 "invoice_date_due": inv.get("invoice_date_due", "")
-            })
+            }
+            for inv in _search_read_paged(uid, query)
+        ]
         
-        print(f"{Fore.GREEN}[SUCCESS] Retrieved {len(invoices)} invoices with state='{state}'")
+        if not invoices:
+            _log(1, Fore.YELLOW, f"[WARNING] No invoices found with state='{state}'")
+            return []
+        
+        _log(1, Fore.GREEN, f"[SUCCESS] Retrieved {len(invoices)} invoices with state='{state}'")
         return invoices
         
+    except OdooRPCError:
+        # Already reported by _make_jsonrpc_request
+        return None
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error fetching invoices: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error fetching invoices: {str(e)}")
         return None
 
 
@@ -209,52 +604,45 @@ def create_invoice_draft(customer_name, amount, description, due_date, dry_run=N
     """
     # Check dry run mode
     if dry_run is None:
-        dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
+        dry_run = _DRY_RUN_DEFAULT
     
     if dry_run:
-        print(f"{Fore.YELLOW}[DRY RUN] Would create draft invoice:")
-        print(f"  Customer: {customer_name}")
-        print(f"  Amount: {amount}")
-        print(f"  Description: {description}")
-        print(f"  Due Date: {due_date}")
+        _log(1, Fore.YELLOW, "[DRY RUN] Would create draft invoice:")
+        _log(1, "", f"  Customer: {customer_name}")
+        _log(1, "", f"  Amount: {amount}")
+        _log(1, "", f"  Description: {description}")
+        _log(1, "", f"  Due Date: {due_date}")
         return -1  # Return -1 to indicate dry run
     
     try:
-        uid = authenticate()
+        uid = _get_uid()
         if not uid:
             return None
         
         # First, find or create the partner
-        partner_params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
+        partner_result = _make_jsonrpc_request(_object_params(uid, {
             "model": "res.partner",
-            "domain": [["name", "=", customer_name]]
-        }
-        
-        partner_result = _make_jsonrpc_request("/web/dataset/search_read", partner_params, method="call")
+            "domain": [["name", "=", customer_name]],
+            "fields": ["id"],
+            "limit": 1
+        }))
         
         partner_id = None
-        if partner_result and partner_result.get("records"):
-            partner_id = partner_result["records"][0]["id"]
+        if _records(partner_result):
+            partner_id = _records(partner_result)[0]["id"]
         else:
             # Create new partner
-            create_result = _make_jsonrpc_request("/web/dataset/call_kw", {
-                "db": ODOO_DB,
-                "uid": uid,
-                "password": ODOO_PASSWORD,
+            create_result = _make_jsonrpc_request(_object_params(uid, {
                 "model": "res.partner",
                 "method": "create",
-                "args": [[{"name": customer_name}]],
-                "kwargs": {}
-            }, method="call")
+                "args": [[{"name": customer_name}]]
+            }))
             
             if create_result:
                 partner_id = create_result
-                print(f"{Fore.GREEN}[SUCCESS] Created new partner: {customer_name} (ID: {partner_id})")
+                _log(1, Fore.GREEN, f"[SUCCESS] Created new partner: {customer_name} (ID: {partner_id})")
             else:
-                print(f"{Fore.RED}[ERROR] Failed to create partner: {customer_name}")
+                _log(0, Fore.RED, f"[ERROR] Failed to create partner: {customer_name}")
                 return None
         
         # Create the invoice
@@ -271,31 +659,115 @@ def create_invoice_draft(customer_name, amount, description, due_date, dry_run=N
             ]
         }
         
-        create_invoice_params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
+        result = _make_jsonrpc_request(_object_params(uid, {
             "model": "account.move",
             "method": "create",
-            "args": [[invoice_values]],
-            "kwargs": {}
-        }
-        
-        result = _make_jsonrpc_request("/web/dataset/call_kw", create_invoice_params, method="call")
+            "args": [[invoice_values]]
+        }))
         
         if result:
             invoice_id = result
-            print(f"{Fore.GREEN}[SUCCESS] Created draft invoice ID: {invoice_id}")
+            _log(1, Fore.GREEN, f"[SUCCESS] Created draft invoice ID: {invoice_id}")
             return invoice_id
         else:
-            print(f"{Fore.RED}[ERROR] Failed to create invoice")
+            _log(0, Fore.RED, "[ERROR] Failed to create invoice")
             return None
             
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error creating invoice: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error creating invoice: {str(e)}")
         return None
 
 
+def _partner_name(pid, default=""):
+    """
+    Return the display name from an Odoo many2one value.
+    
+    JSON-RPC encodes many2one fields as [id, name] lists, or False when empty;
+    anything else is stringified.
+    """
+    if not pid:
+        return default
+    if type(pid) is list and len(pid) >= 2:
+        return pid[1]
+    return str(pid)
+
+
+def _search_read_paged(uid, query, batch=_PAGE_SIZE):
+    """
+    Yield the rows of a search_read or read_group query page by page.
+    
+    Uses Odoo's limit/offset so only one page of raw records is held at a
+    time. Raises OdooRPCError if any page fails.
+    """
+    offset = 0
+    
+    while True:
+        result = _make_jsonrpc_request(_object_params(uid, {**query, "limit": batch, "offset": offset}))
+        if isinstance(result, OdooRPCError):
+            raise result
+        
+        records = _records(result)
+        yield from records
+        
+        if len(records) < batch:
+            break
+        offset += batch
+
+
+def _records(result):
+    """Return the rows of a search_read or read_group result (empty on failure)."""
+    if isinstance(result, list):
+        return result
+    return result.get("records", []) if result else []
+
+
+@functools.lru_cache(maxsize=32)
+def _month_range(year, month):
+    """Return ISO dates for the first day of the month and of the following month."""
+    start = date(year, month, 1)
+    end = date(year + (month == 12), month % 12 + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def _revenue_query(year, month):
+    """Build the read_group query summing paid invoices within a month."""
+    start_date, end_date = _month_range(year, month)
+    
+    # Domain: paid invoices within the month
+    return {
+        "model": "account.move",
+        "domain": [
+            ["state", "=", "posted"],
+            ["move_type", "=", "out_invoice"],
+            ["invoice_date", ">=", start_date],
+            ["invoice_date", "<", end_date]
+        ],
+        # Let Postgres do the SUM/COUNT and return a single row
+        "method": "read_group",
+        "fields": ["amount_total:sum"],
+        "groupby": [],
+        "lazy": False
+    }
+
+
+def _parse_revenue(records):
+    """Aggregate revenue groups (or plain invoice rows) into total, count and average."""
+    total_revenue = 0.0
+    invoice_count = 0
+    
+    for group in records:
+        total_revenue += group.get("amount_total") or 0.0
+        invoice_count += group.get("__count", 1)
+    
+    avg_invoice_value = total_revenue / invoice_count if invoice_count > 0 else 0.0
+    
+    return {
+        "total_revenue": round(total_revenue, 2),
+        "invoice_count": invoice_count,
+        "avg_invoice_value": round(avg_invoice_value, 2)
+    }
+
+
 def get_monthly_revenue(year, month):
     """
     Fetch all paid invoices for a specific month.
@@ -308,60 +780,67 @@ def get_monthly_revenue(year, month):
         Dict with: total_revenue, invoice_count, avg_invoice_value
     """
     try:
-        uid = authenticate()
+        uid = _get_uid()
         if not uid:
             return None
         
-        # Calculate date range for the month
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-        
-        # Domain: paid invoices within the month
-        domain = [
-            ["state", "=", "posted"],
-            ["move_type", "=", "out_invoice"],
-            ["invoice_date", ">=", start_date],
-            ["invoice_date", "<", end_date]
-        ]
-        
-        params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
-            "model": "account.move",
-            "domain": domain,
-            "fields": ["amount_total"]
-        }
-        
-        result = _make_jsonrpc_request("/web/dataset/search_read", params, method="call")
-        
-        total_revenue = 0.0
-        invoice_count = 0
-        
-        if result and result.get("records"):
-            for inv in result["records"]:
-                total_revenue += inv.get("amount_total", 0.0)
-                invoice_count += 1
-        
-        avg_invoice_value = total_revenue / invoice_count if invoice_count > 0 else 0.0
-        
-        revenue_data = {
-            "total_revenue": round(total_revenue, 2),
-            "invoice_count": invoice_count,
-            "avg_invoice_value": round(avg_invoice_value, 2)
-        }
+        result = _make_jsonrpc_request(_object_params(uid, _revenue_query(year, month)))
+        if isinstance(result, OdooRPCError):
+            return None
+        revenue_data = _parse_revenue(_records(result))
         
-        print(f"{Fore.GREEN}[SUCCESS] Monthly revenue for {year}-{month:02d}: ${total_revenue:.2f} ({invoice_count} invoices)")
+        _log(1, Fore.GREEN, f"[SUCCESS] Monthly revenue for {year}-{month:02d}: ${revenue_data['total_revenue']:.2f} ({revenue_data['invoice_count']} invoices)")
         return revenue_data
         
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error fetching monthly revenue: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error fetching monthly revenue: {str(e)}")
         return None
 
 
+def _overdue_query(today):
+    """Build the search_read query for unpaid invoices due before `today` (a date)."""
+    
+    # Domain: open invoices with due date before today
+    return {
+        "model": "account.move",
+        "domain": [
+            ["state", "in", ["open", "posted"]],
+            ["move_type", "=", "out_invoice"],
+            ["invoice_date_due", "<", today.isoformat()],
+            ["payment_state", "=", "not_paid"]
+        ],
+        "fields": ["id", "name", "partner_id", "amount_total", "amount_residual", "invoice_date_due"],
+        "order": "id"
+    }
+
+
+def _days_overdue(due_date, today_ord):
+    """Days between an ISO due date and today's ordinal (0 if missing or malformed)."""
+    if not due_date:
+        return 0
+    try:
+        return today_ord - date.fromisoformat(due_date).toordinal()
+    except ValueError:
+        return 0
+
+
+def _parse_overdue(records, today):
+    """Convert overdue invoice records into client/amount/days-overdue rows as of `today`."""
+    today_ord = today.toordinal()
+    
+    return [
+        {
+            "id": inv.get("id"),
+            "name": inv.get("name", ""),
+            "client_name": _partner_name(inv.get("partner_id")),
+            "amount": inv.get("amount_total", 0.0),
+            "amount_due": inv.get("amount_residual", 0.0),
+            "days_overdue": _days_overdue(inv.get("invoice_date_due"), today_ord)
+        }
+        for inv in records
+    ]
+
+
 def get_overdue_invoices():
     """
     Fetch all invoices past their due date.
@@ -370,70 +849,84 @@ def get_overdue_invoices():
         List of overdue invoices with: client name, amount, days overdue
     """
     try:
-        uid = authenticate()
+        uid = _get_uid()
         if not uid:
             return None
         
-        today = datetime.now().strftime("%Y-%m-%d")
+        # One clock read for both the domain filter and days overdue
+        today = date.today()
+        overdue_list = _parse_overdue(_search_read_paged(uid, _overdue_query(today)), today)
         
-        # Domain: open invoices with due date before today
-        domain = [
-            ["state", "in", ["open", "posted"]],
-            ["move_type", "=", "out_invoice"],
-            ["invoice_date_due", "<", today],
-            ["payment_state", "=", "not_paid"]
-        ]
-        
-        params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
-            "model": "account.move",
-            "domain": domain,
-            "fields": ["id", "name", "partner_id", "amount_total", "amount_residual", "invoice_date_due"]
-        }
-        
-        result = _make_jsonrpc_request("/web/dataset/search_read", params, method="call")
-        
-        overdue_list = []
-        today_date = datetime.now()
-        
-        if result and result.get("records"):
-            for inv in result["records"]:
-                # Handle partner_id
-                partner_name = ""
-                if inv.get("partner_id"):
-                    if isinstance(inv["partner_id"], list) and len(inv["partner_id"]) >= 2:
-                        partner_name = inv["partner_id"][1]
-                    else:
-                        partner_name = str(inv["partner_id"])
-                
-                # Calculate days overdue
-                days_overdue = 0
-                if inv.get("invoice_date_due"):
-                    try:
-                        due_date = datetime.strptime(inv["invoice_date_due"], "%Y-%m-%d")
-                        days_overdue = (today_date - due_date).days
-                    except ValueError:
-                        days_overdue = 0
-                
-                overdue_list.append({
-                    "id": inv.get("id"),
-                    "name": inv.get("name", ""),
-                    "client_name": partner_name,
-                    "amount": inv.get("amount_total", 0.0),
-                    "amount_due": inv.get("amount_residual", 0.0),
-                    "days_overdue": days_overdue
-                })
-        
-        print(f"{Fore.GREEN}[SUCCESS] Found {len(overdue_list)} overdue invoices")
+        _log(1, Fore.GREEN, f"[SUCCESS] Found {len(overdue_list)} overdue invoices")
         return overdue_list
         
+    except OdooRPCError:
+        # Already reported by _make_jsonrpc_request
+        return None
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error fetching overdue invoices: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error fetching overdue invoices: {str(e)}")
         return None
 
 
+def _expenses_query(year, month):
+    """Build the read_group query totalling vendor bills per vendor within a month."""
+    start_date, end_date = _month_range(year, month)
+    
+    # Domain: vendor bills within the month
+    return {
+        "model": "account.move",
+        "domain": [
+            ["state", "=", "posted"],
+            ["move_type", "in", ["in_invoice", "in_refund"]],
+            ["invoice_date", ">=", start_date],
+            ["invoice_date", "<", end_date]
+        ],
+        # One row per vendor; categories are assigned client-side
+        "method": "read_group",
+        "fields": ["partner_id", "amount_total:sum"],
+        "groupby": ["partner_id"],
+        "lazy": False
+    }
+
+
+def _parse_expenses(records):
+    """Aggregate per-vendor groups (or plain bill rows) into a total and per-category breakdown."""
+    total_expenses = 0.0
+    by_category = {}
+    
+    for bill in records:
+        amount = bill.get("amount_total") or 0.0
+        total_expenses += amount
+        
+        # Get vendor name for category breakdown
+        vendor_name = _partner_name(bill.get("partner_id"), "Other")
+        
+        # Categorize by vendor type (simplified categorization)
+        category = _categorize_vendor(vendor_name)
+        
+        bucket = by_category.get(category)
+        if bucket is None:
+            bucket = by_category[category] = {"total": 0.0, "count": 0, "vendors": {}}
+        
+        bucket["total"] += amount
+        bucket["count"] += bill.get("__count", 1)
+        bucket["vendors"][vendor_name] = None
+    
+    # Vendor dicts act as insertion-ordered sets; list their keys for JSON
+    by_category_serializable = {}
+    for cat, data in by_category.items():
+        by_category_serializable[cat] = {
+            "total": round(data["total"], 2),
+            "count": data["count"],
+            "vendors": list(data["vendors"].keys())
+        }
+    
+    return {
+        "total_expenses": round(total_expenses, 2),
+        "by_category": by_category_serializable
+    }
+
+
 def get_expenses(month, year):
     """
     Fetch vendor bills (expenses) for a specific month.
@@ -446,121 +939,152 @@ def get_expenses(month, year):
         Dict with: total_expenses, by_category breakdown
     """
     try:
-        uid = authenticate()
+        uid = _get_uid()
         if not uid:
             return None
         
-        # Calculate date range for the month
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-        
-        # Domain: vendor bills within the month
-        domain = [
-            ["state", "=", "posted"],
-            ["move_type", "in", ["in_invoice", "in_refund"]],
-            ["invoice_date", ">=", start_date],
-            ["invoice_date", "<", end_date]
-        ]
-        
-        params = {
-            "db": ODOO_DB,
-            "uid": uid,
-            "password": ODOO_PASSWORD,
-            "model": "account.move",
-            "domain": domain,
-            "fields": ["id", "name", "partner_id", "amount_total", "invoice_line_ids"]
-        }
-        
-        result = _make_jsonrpc_request("/web/dataset/search_read", params, method="call")
-        
-        total_expenses = 0.0
-        by_category = {}
-        
-        if result and result.get("records"):
-            for bill in result["records"]:
-                amount = bill.get("amount_total", 0.0)
-                total_expenses += amount
-                
-                # Get vendor name for category breakdown
-                vendor_name = "Other"
-                if bill.get("partner_id"):
-                    if isinstance(bill["partner_id"], list) and len(bill["partner_id"]) >= 2:
-                        vendor_name = bill["partner_id"][1]
-                    else:
-                        vendor_name = str(bill["partner_id"])
-                
-                # Categorize by vendor type (simplified categorization)
-                category = _categorize_vendor(vendor_name)
-                
-                if category not in by_category:
-                    by_category[category] = {"total": 0.0, "count": 0, "vendors": set()}
-                
-                by_category[category]["total"] += amount
-                by_category[category]["count"] += 1
-                by_category[category]["vendors"].add(vendor_name)
-        
-        # Convert sets to lists for JSON serialization
-        by_category_serializable = {}
-        for cat, data in by_category.items():
-            by_category_serializable[cat] = {
-                "total": round(data["total"], 2),
-                "count": data["count"],
-                "vendors": list(data["vendors"])
-            }
+        # Totals accumulate per vendor group as pages arrive
+        expenses_data = _parse_expenses(_search_read_paged(uid, _expenses_query(year, month)))
         
-        expenses_data = {
-            "total_expenses": round(total_expenses, 2),
-            "by_category": by_category_serializable
-        }
-        
-        print(f"{Fore.GREEN}[SUCCESS] Monthly expenses for {year}-{month:02d}: ${total_expenses:.2f}")
+        _log(1, Fore.GREEN, f"[SUCCESS] Monthly expenses for {year}-{month:02d}: ${expenses_data['total_expenses']:.2f}")
         return expenses_data
         
+    except OdooRPCError:
+        # Already reported by _make_jsonrpc_request
+        return None
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error fetching expenses: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error fetching expenses: {str(e)}")
         return None
 
 
+# Expense categories in priority order; the first category with a keyword
+# anywhere in the vendor name wins
+_VENDOR_CATEGORIES = [
+    ("Technology", ["software", "tech", "cloud", "aws", "azure", "google", "microsoft", "adobe", "github"]),
+    ("Utilities", ["electric", "water", "gas", "utility", "power", "internet", "telecom", "phone"]),
+    ("Office Supplies", ["office", "supply", "stationery", "furniture", "equipment"]),
+    ("Professional Services", ["legal", "law", "consulting", "accounting", "audit", "advisory"]),
+    ("Rent & Facilities", ["rent", "lease", "property", "real estate", "building"]),
+    ("Marketing", ["marketing", "advertising", "media", "social", "seo", "google ads"]),
+]
+_VENDOR_CATEGORY_RES = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in _VENDOR_CATEGORIES
+]
+
+
 def _categorize_vendor(vendor_name):
     """
     Categorize vendors into expense categories.
     """
     vendor_lower = vendor_name.lower()
     
-    # Technology/Software
-    tech_keywords = ["software", "tech", "cloud", "aws", "azure", "google", "microsoft", "adobe", "github"]
-    if any(kw in vendor_lower for kw in tech_keywords):
-        return "Technology"
+    for category, pattern in _VENDOR_CATEGORY_RES:
+        if pattern.search(vendor_lower):
+            return category
+    
+    return "Other Expenses"
+
+
+async def get_monthly_revenue_async(year, month, client=None):
+    """
+    Async variant of get_monthly_revenue.
+    
+    Args:
+        year: Year (e.g., 2024)
+        month: Month (1-12)
+        client: Optional shared httpx.AsyncClient
+    """
+    try:
+        result = await _query_async(client, _revenue_query(year, month))
+        if isinstance(result, OdooRPCError):
+            return None
+        return _parse_revenue(_records(result))
+    except Exception as e:
+        _log(0, Fore.RED, f"[ERROR] Error fetching monthly revenue: {str(e)}")
+        return None
+
+
+async def get_expenses_async(month, year, client=None):
+    """
+    Async variant of get_expenses.
+    
+    Args:
+        month: Month (1-12)
+        year: Year (e.g., 2024)
+        client: Optional shared httpx.AsyncClient
+    """
+    try:
+        result = await _query_async(client, _expenses_query(year, month))
+        if isinstance(result, OdooRPCError):
+            return None
+        return _parse_expenses(_records(result))
+    except Exception as e:
+        _log(0, Fore.RED, f"[ERROR] Error fetching expenses: {str(e)}")
+        return None
+
+
+async def get_overdue_invoices_async(client=None):
+    """
+    Async variant of get_overdue_invoices.
     
-    # Utilities
-    utility_keywords = ["electric", "water", "gas", "utility", "power", "internet", "telecom", "phone"]
-    if any(kw in vendor_lower for kw in utility_keywords):
-        return "Utilities"
+    Args:
+        client: Optional shared httpx.AsyncClient
+    """
+    try:
+        today = date.today()
+        result = await _query_async(client, _overdue_query(today))
+        if isinstance(result, OdooRPCError):
+            return None
+        return _parse_overdue(_records(result), today)
+    except Exception as e:
+        _log(0, Fore.RED, f"[ERROR] Error fetching overdue invoices: {str(e)}")
+        return None
+
+
+def _build_summary(month, year, revenue_data, expenses_data, overdue_list):
+    """Combine revenue, expenses and overdue results into the summary dict."""
+    revenue_data = revenue_data or _parse_revenue([])
+    expenses_data = expenses_data or _parse_expenses([])
+    overdue_list = overdue_list or []
     
-    # Office/Supplies
-    office_keywords = ["office", "supply", "stationery", "furniture", "equipment"]
-    if any(kw in vendor_lower for kw in office_keywords):
-        return "Office Supplies"
+    # Calculate totals
+    total_revenue = revenue_data.get("total_revenue", 0.0)
+    total_expenses = expenses_data.get("total_expenses", 0.0)
+    profit = total_revenue - total_expenses
     
-    # Professional Services
-    service_keywords = ["legal", "law", "consulting", "accounting", "audit", "advisory"]
-    if any(kw in vendor_lower for kw in service_keywords):
-        return "Professional Services"
+    overdue_count = len(overdue_list)
+    overdue_amount = sum(inv.get("amount_due", inv.get("amount", 0.0)) for inv in overdue_list)
     
-    # Rent/Facilities
-    rent_keywords = ["rent", "lease", "property", "real estate", "building"]
-    if any(kw in vendor_lower for kw in rent_keywords):
-        return "Rent & Facilities"
+    summary = {
+        "period": f"{year}-{month:02d}",
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "revenue": {
+            "total_revenue": round(total_revenue, 2),
+            "invoice_count": revenue_data.get("invoice_count", 0),
+            "avg_invoice_value": revenue_data.get("avg_invoice_value", 0.0)
+        },
+        "expenses": {
+            "total_expenses": round(total_expenses, 2),
+            "by_category": expenses_data.get("by_category", {})
+        },
+        "profit": round(profit, 2),
+        "profit_margin": round((profit / total_revenue * 100) if total_revenue > 0 else 0.0, 2),
+        "overdue": {
+            "count": overdue_count,
+            "total_amount": round(overdue_amount, 2),
+            "invoices": overdue_list
+        }
+    }
     
-    # Marketing
-    marketing_keywords = ["marketing", "advertising", "media", "social", "seo", "google ads"]
-    if any(kw in vendor_lower for kw in marketing_keywords):
-        return "Marketing"
+    if _LOG_LEVEL >= 1:
+        _log(1, Fore.GREEN, "[SUCCESS] Financial summary generated:")
+        _log(1, "", f"  Revenue: ${total_revenue:.2f}")
+        _log(1, "", f"  Expenses: ${total_expenses:.2f}")
+        _log(1, "", f"  Profit: ${profit:.2f}")
+        _log(1, "", f"  Overdue: {overdue_count} invoices (${overdue_amount:.2f})")
     
-    return "Other Expenses"
+    return summary
 
 
 def generate_financial_summary(month, year):
@@ -575,65 +1099,100 @@ def generate_financial_summary(month, year):
         Dict with: revenue, expenses, profit, overdue_count, overdue_amount
     """
     try:
-        print(f"{Fore.CYAN}[INFO] Generating financial summary for {year}-{month:02d}...")
-        
-        # Fetch revenue data
-        revenue_data = get_monthly_revenue(year, month)
-        if not revenue_data:
-            revenue_data = {"total_revenue": 0.0, "invoice_count": 0, "avg_invoice_value": 0.0}
-        
-        # Fetch expenses data
-        expenses_data = get_expenses(month, year)
-        if not expenses_data:
-            expenses_data = {"total_expenses": 0.0, "by_category": {}}
-        
-        # Fetch overdue invoices
-        overdue_list = get_overdue_invoices()
-        if not overdue_list:
-            overdue_list = []
-        
-        # Calculate totals
-        total_revenue = revenue_data.get("total_revenue", 0.0)
-        total_expenses = expenses_data.get("total_expenses", 0.0)
-        profit = total_revenue - total_expenses
-        
-        overdue_count = len(overdue_list)
-        overdue_amount = sum(inv.get("amount_due", inv.get("amount", 0.0)) for inv in overdue_list)
-        
-        summary = {
-            "period": f"{year}-{month:02d}",
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "revenue": {
-                "total_revenue": round(total_revenue, 2),
-                "invoice_count": revenue_data.get("invoice_count", 0),
-                "avg_invoice_value": revenue_data.get("avg_invoice_value", 0.0)
-            },
-            "expenses": {
-                "total_expenses": round(total_expenses, 2),
-                "by_category": expenses_data.get("by_category", {})
-            },
-            "profit": round(profit, 2),
-            "profit_margin": round((profit / total_revenue * 100) if total_revenue > 0 else 0.0, 2),
-            "overdue": {
-                "count": overdue_count,
-                "total_amount": round(overdue_amount, 2),
-                "invoices": overdue_list
-            }
-        }
+        _log(1, Fore.CYAN, f"[INFO] Generating financial summary for {year}-{month:02d}...")
         
-        print(f"{Fore.GREEN}[SUCCESS] Financial summary generated:")
-        print(f"  Revenue: ${total_revenue:.2f}")
-        print(f"  Expenses: ${total_expenses:.2f}")
-        print(f"  Profit: ${profit:.2f}")
-        print(f"  Overdue: {overdue_count} invoices (${overdue_amount:.2f})")
+        # No uid means no figures at all, not an all-zero month
+        uid = _get_uid()
+        if not uid:
+            _log(0, Fore.RED, f"[ERROR] Cannot generate financial summary: {uid.kind} error logging in to Odoo")
+            return None
         
-        return summary
+        # Fetch revenue, expenses and overdue invoices in one round trip when batching is enabled
+        today = date.today()
+        queries = [_revenue_query(year, month), _expenses_query(year, month), _overdue_query(today)]
+        
+        results = _make_jsonrpc_batch([_object_params(uid, query) for query in queries])
+        if results is None:
+            # Batching off or unsupported: one request per query
+            results = [
+                _make_jsonrpc_request(_object_params(uid, query))
+                for query in queries
+            ]
+        
+        # A failed query means missing figures, not zero revenue/expenses
+        if any(isinstance(result, OdooRPCError) for result in results):
+            _log(0, Fore.RED, "[ERROR] Could not fetch all financial data from Odoo")
+            return None
+        
+        revenue_data = _parse_revenue(_records(results[0]))
+        expenses_data = _parse_expenses(_records(results[1]))
+        overdue_list = _parse_overdue(_records(results[2]), today)
+        
+        return _build_summary(month, year, revenue_data, expenses_data, overdue_list)
         
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error generating financial summary: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error generating financial summary: {str(e)}")
         return None
 
 
+async def generate_financial_summary_async(month, year):
+    """
+    Generate the financial summary with revenue, expenses and overdue
+    invoices fetched concurrently, so wall time is the slowest call
+    rather than the sum of all three.
+    
+    Args:
+        month: Month (1-12)
+        year: Year (e.g., 2024)
+    
+    Returns:
+        Same dict as generate_financial_summary
+    """
+    try:
+        _log(1, Fore.CYAN, f"[INFO] Generating financial summary for {year}-{month:02d}...")
+        
+        # Authenticate once up front so the concurrent queries share the cached uid
+        uid = await asyncio.to_thread(_get_uid)
+        if not uid:
+            _log(0, Fore.RED, f"[ERROR] Cannot generate financial summary: {uid.kind} error logging in to Odoo")
+            return None
+        
+        async def gather_all(client):
+            return await asyncio.gather(
+                get_monthly_revenue_async(year, month, client),
+                get_expenses_async(month, year, client),
+                get_overdue_invoices_async(client)
+            )
+        
+        if HTTPX_AVAILABLE:
+            async with _async_client() as client:
+                revenue_data, expenses_data, overdue_list = await gather_all(client)
+        else:
+            revenue_data, expenses_data, overdue_list = await gather_all(None)
+        
+        if revenue_data is None or expenses_data is None or overdue_list is None:
+            _log(0, Fore.RED, "[ERROR] Could not fetch all financial data from Odoo")
+            return None
+        
+        return _build_summary(month, year, revenue_data, expenses_data, overdue_list)
+        
+    except Exception as e:
+        _log(0, Fore.RED, f"[ERROR] Error generating financial summary: {str(e)}")
+        return None
+
+
+def generate_financial_summary_concurrent(month, year):
+    """Synchronous wrapper around generate_financial_summary_async for CLI use."""
+    return asyncio.run(generate_financial_summary_async(month, year))
+
+
+def _summary_cache_key(summary_dict):
+    """Hash the summary data, ignoring generated_at so unchanged figures hash equal."""
+    data = {k: v for k, v in summary_dict.items() if k != "generated_at"}
+    payload = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 def save_summary_to_vault(summary_dict):
     """
     Save financial summary to a markdown file in the vault.
@@ -646,7 +1205,7 @@ def save_summary_to_vault(summary_dict):
     """
     try:
         if not summary_dict:
-            print(f"{Fore.RED}[ERROR] No summary data to save")
+            _log(0, Fore.RED, "[ERROR] No summary data to save")
             return None
         
         # Create vault directory if it doesn't exist
@@ -657,6 +1216,16 @@ def save_summary_to_vault(summary_dict):
         filename = f"{period}_summary.md"
         filepath = VAULT_PATH / filename
         
+        # Skip rendering and writing when the figures haven't changed
+        cache_key = _summary_cache_key(summary_dict)
+        key_path = VAULT_PATH / f".{filename}.cache_key"
+        try:
+            if filepath.exists() and key_path.read_text(encoding="utf-8") == cache_key:
+                _log(1, Fore.CYAN, f"[INFO] Summary unchanged, keeping {filepath}")
+                return str(filepath)
+        except OSError:
+            pass
+        
         # Build markdown content
         revenue = summary_dict.get("revenue", {})
         expenses = summary_dict.get("expenses", {})
@@ -664,90 +1233,56 @@ def save_summary_to_vault(summary_dict):
         profit_margin = summary_dict.get("profit_margin", 0.0)
         overdue = summary_dict.get("overdue", {})
         
-        content = f"""# Financial Summary - {period}
-
-**Generated:** {summary_dict.get("generated_at", "N/A")}
-
----
-
-## Revenue Overview
-
-| Metric | Value |
-|--------|-------|
-| Total Revenue | ${revenue.get("total_revenue", 0):,.2f} |
-| Invoice Count | {revenue.get("invoice_count", 0)} |
-| Avg Invoice Value | ${revenue.get("avg_invoice_value", 0):,.2f} |
-
----
-
-## Expenses Overview
-
-| Metric | Value |
-|--------|-------|
-| Total Expenses | ${expenses.get("total_expenses", 0):,.2f} |
-
-### Expenses by Category
-
-| Category | Total | Count | Vendors |
-|----------|-------|-------|---------|
-"""
-        
-        by_category = expenses.get("by_category", {})
-        for category, data in sorted(by_category.items(), key=lambda x: x[1].get("total", 0), reverse=True):
-            vendors_str = ", ".join(data.get("vendors", [])[:3])  # Show first 3 vendors
-            if len(data.get("vendors", [])) > 3:
-                vendors_str += f" (+{len(data.get('vendors', [])) - 3} more)"
-            content += f"| {category} | ${data.get('total', 0):,.2f} | {data.get('count', 0)} | {vendors_str} |\n"
-        
-        content += f"""
----
-
-## Profit & Loss
-
-| Metric | Value |
-|--------|-------|
-| Total Revenue | ${revenue.get("total_revenue", 0):,.2f} |
-| Total Expenses | ${expenses.get("total_expenses", 0):,.2f} |
-| **Net Profit** | **${profit:,.2f}** |
-| Profit Margin | {profit_margin:.1f}% |
-
----
-
-## Overdue Invoices
-
-| Metric | Value |
-|--------|-------|
-| Count | {overdue.get("count", 0)} |
-| Total Amount Due | ${overdue.get("total_amount", 0):,.2f} |
-
-### Overdue Invoice Details
-
-| Invoice | Client | Amount Due | Days Overdue |
-|---------|--------|------------|--------------|
-"""
+        # Table rows are rendered up front; the fixed report shape is a template
+        category_rows = []
+        for category, data in sorted(expenses.get("by_category", {}).items(), key=lambda x: x[1].get("total", 0), reverse=True):
+            vendors = data.get("vendors", [])
+            vendors_str = ", ".join(vendors[:3])  # Show first 3 vendors
+            if len(vendors) > 3:
+                vendors_str += f" (+{len(vendors) - 3} more)"
+            category_rows.append(_CATEGORY_ROW.format_map({
+                "category": category,
+                "total": data.get("total", 0),
+                "count": data.get("count", 0),
+                "vendors": vendors_str
+            }))
         
         overdue_invoices = overdue.get("invoices", [])
-        if overdue_invoices:
-            for inv in sorted(overdue_invoices, key=lambda x: x.get("days_overdue", 0), reverse=True):
-                content += f"| {inv.get('name', 'N/A')} | {inv.get('client_name', 'N/A')} | ${inv.get('amount_due', inv.get('amount', 0)):,.2f} | {inv.get('days_overdue', 0)} |\n"
-        else:
-            content += "| - | No overdue invoices | - | - |\n"
-        
-        content += """
----
-
-*Report generated by odoo_mcp.py*
-"""
-        
-        # Write to file
+        overdue_rows = [
+            _OVERDUE_ROW.format_map({
+                "name": inv.get("name", "N/A"),
+                "client": inv.get("client_name", "N/A"),
+                "due": inv.get("amount_due", inv.get("amount", 0)),
+                "days": inv.get("days_overdue", 0)
+            })
+            for inv in sorted(overdue_invoices, key=lambda x: x.get("days_overdue", 0), reverse=True)
+        ] or [_NO_OVERDUE_ROW]
+        
+        content = _SUMMARY_TEMPLATE.format_map({
+            "period": period,
+            "generated": summary_dict.get("generated_at", "N/A"),
+            "total_revenue": revenue.get("total_revenue", 0),
+            "invoice_count": revenue.get("invoice_count", 0),
+            "avg_invoice": revenue.get("avg_invoice_value", 0),
+            "total_expenses": expenses.get("total_expenses", 0),
+            "category_rows": "".join(category_rows),
+            "profit": profit,
+            "profit_margin": profit_margin,
+            "overdue_count": overdue.get("count", 0),
+            "overdue_amount": overdue.get("total_amount", 0),
+            "overdue_rows": "".join(overdue_rows)
+        })
+        
+        # Write to file in one call
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
+        key_path.write_text(cache_key, encoding="utf-8")
         
-        print(f"{Fore.GREEN}[SUCCESS] Summary saved to {filepath}")
+        _log(1, Fore.GREEN, f"[SUCCESS] Summary saved to {filepath}")
         return str(filepath)
         
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Error saving summary to vault: {str(e)}")
+        _log(0, Fore.RED, f"[ERROR] Error saving summary to vault: {str(e)}")
         return None
 
 
@@ -761,7 +1296,7 @@ if __name__ == "__main__":
     
     # Test authentication
     print(f"{Fore.CYAN}--- Testing Authentication ---")
-    uid = authenticate()
+    uid = _get_uid()
     
     if uid:
         # Test getting invoices
@@ -783,7 +1318,7 @@ if __name__ == "__main__":
         
         # Test full summary
         print(f"\n{Fore.CYAN}--- Testing Financial Summary ---")
-        summary = generate_financial_summary(current.month, current.year)
+        summary = generate_financial_summary_concurrent(current.month, current.year)
         
         if summary:
             print(f"\n{Fore.CYAN}--- Testing Save Summary ---")
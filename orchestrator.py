@@ -4,21 +4,45 @@ AI Orchestrator Service
 Watches Needs_Action for tasks, sends to Qwen API for analysis, creates plans.
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import os
 import re
 import shutil
 import signal
+import sqlite3
 import sys
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 
+import httpx
 import openai
 from colorama import init, Fore, Style
 from dotenv import load_dotenv
 
+# Optional: watchdog for event-driven pickup of new tasks (falls back to polling)
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# Optional: orjson for faster log serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -44,17 +68,217 @@ class Config:
     OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
     OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
     
-    # Polling interval (seconds)
+    # Polling interval (seconds); with watchdog this is only a safety sweep
     POLL_INTERVAL = 30
     
+    # Wait after a file event so the writer can finish the file (seconds)
+    EVENT_SETTLE_DELAY = 0.5
+    
     # Retry settings
     MAX_RETRIES = 3
     RETRY_DELAY = 2
+    
+    # Tasks analyzed concurrently per batch
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "10"))
+    
+    # fsync plan files, log lines and directory entries so a crash cannot lose a processed task
+    DURABLE_WRITES = os.getenv("DURABLE_WRITES", "0") == "1"
+    
+    # Processed task paths remembered to avoid re-processing (oldest forgotten first)
+    PROCESSED_HISTORY = 10000
+    
+    # Worker threads for blocking file and cache I/O
+    IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+    
+    # Tasks sent together in one API request (1 = one request per task)
+    ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "1"))
+    
+    # Connection pool for the async OpenRouter client
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONN", "200"))
+    HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "150"))
+    HTTP_TIMEOUT = 60.0
+    HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+    
+    # Plan cache: identical task content is not sent to the API twice
+    PLAN_CACHE_FILE = VAULT_DIR / ".plan_cache.sqlite"
+    PLAN_CACHE_SIZE = 256
+    PLAN_CACHE_TTL = int(os.getenv("PLAN_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+# Tasks whose frontmatter sets "no_cache: true" are always sent to the API
+_NO_CACHE_RE = re.compile(r'\A---\s*\n(?:(?!^---).)*?^no_cache:\s*true\s*$', re.DOTALL | re.MULTILINE | re.IGNORECASE)
+
+# Plan filename sanitizing and plan section extraction
+_SAFE_NAME_RE = re.compile(r'[^\w\-_]')
+_OBJECTIVE_RE = re.compile(r'## Objective\s*\n(.*?)(?=##|\Z)', re.DOTALL | re.IGNORECASE)
+_STEPS_RE = re.compile(r'## Steps?\s*\n(.*?)(?=##|\Z)', re.DOTALL | re.IGNORECASE)
+_RISK_RE = re.compile(r'## Risk Assessment\s*\n(.*?)(?=##|\Z)', re.DOTALL | re.IGNORECASE)
+
+# Plan file layout written by create_plan_file
+_PLAN_TEMPLATE = """---
+created: {created}
+risk_level: {risk_level}
+status: pending
+---
+## Objective
+{objective}
+
+## Steps
+{steps}
+
+## Risk Assessment
+{risk_assessment}
+
+## Requires Approval: {approval}
+
+---
+## Full AI Analysis
+{plan_content}
+"""
+
+# Plan used when no OpenRouter client is available; only the filename varies
+_FALLBACK_PLAN = """## Objective
+Review and complete the task: %s
+
+## Steps
+- [ ] Review task details
+- [ ] Execute required actions
+- [ ] Document results
+
+## Risk Assessment
+Risk Level: MEDIUM (AI analysis unavailable)
+
+## Requires Approval: NO
+"""
+_FALLBACK_RISK = ("MEDIUM", False)
+
+# Risk markers in the AI response, matched case-insensitively in one pass
+_RISK_MARKERS = {
+    "HIGH RISK": "HIGH",
+    "RISK_LEVEL: HIGH": "HIGH",
+    "**HIGH**": "HIGH",
+    "MEDIUM": "MEDIUM",
+    "REQUIRES APPROVAL: YES": "APPROVAL",
+    "REQUIRES APPROVAL: TRUE": "APPROVAL",
+    "FLAG FOR HUMAN APPROVAL": "APPROVAL",
+    "HUMAN APPROVAL REQUIRED": "APPROVAL",
+}
+_RISK_MARKER_RE = re.compile("|".join(re.escape(m) for m in _RISK_MARKERS), re.IGNORECASE)
+_HIGH_MARKER_RE = re.compile("|".join(re.escape(m) for m, tag in _RISK_MARKERS.items() if tag == "HIGH"), re.IGNORECASE)
+# Text kept from the previous stream chunk so markers split across chunks are still found
+_MARKER_OVERLAP = max(len(m) for m in _RISK_MARKERS) - 1
+_RISK_ORDER = ("LOW", "MEDIUM", "HIGH")
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_durable(path: Path, data: bytes):
+    """Write data to a temp file beside path, fsync it, then rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _fsync_dirs(dirs):
+    """fsync directories so renames and new entries in them survive a crash (POSIX only)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    for directory in dirs:
+        fd = os.open(str(directory), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class PlanCache:
+    """LRU cache of analysis results, backed by a SQLite file in the vault."""
+    
+    def __init__(self, db_path: Path, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plans "
+                "(hash TEXT PRIMARY KEY, plan TEXT, risk TEXT, approval INT, ts REAL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Plan cache not persisted: {e}")
+            self._db = None
+    
+    def get(self, key: str) -> Optional[Tuple[str, str, bool]]:
+        """Return the cached (plan_content, risk_level, requires_approval) or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT plan, risk, approval, ts FROM plans WHERE hash = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = ((row[0], row[1], bool(row[2])), row[3])
+            if entry is None:
+                return None
+            
+            result, ts = entry
+            if now - ts > self.ttl:
+                self._memory.pop(key, None)
+                return None
+            
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            self._evict()
+            return result
+    
+    def put(self, key: str, result: Tuple[str, str, bool]):
+        """Store an analysis result in memory and on disk."""
+        ts = time.time()
+        with self._lock:
+            self._memory[key] = (result, ts)
+            self._memory.move_to_end(key)
+            self._evict()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?)",
+                        (key, result[0], result[1], int(result[2]), ts)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Failed to persist cached plan: {e}")
+    
+    def _evict(self):
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
 
 
 class OpenRouterClient:
     """Client for OpenRouter API with retry logic."""
     
+    SYSTEM_PROMPT = """You are a Personal AI Employee. Analyze this task and create a step-by-step action plan in markdown with checkboxes. 
+If task involves money, emails to unknown contacts, or deletions — mark as HIGH RISK and flag for human approval."""
+    
     def __init__(self):
         self.api_key = Config.OPENROUTER_API_KEY
         if not self.api_key:
@@ -64,16 +288,36 @@ class OpenRouterClient:
             api_key=self.api_key,
             base_url=Config.OPENROUTER_BASE_URL
         )
+        # Async client used by the orchestrator loop to analyze tasks concurrently,
+        # on a keep-alive pool sized for MAX_CONCURRENCY parallel requests
+        self.async_client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=Config.OPENROUTER_BASE_URL,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=Config.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE
+                ),
+                timeout=httpx.Timeout(Config.HTTP_TIMEOUT),
+                http2=Config.HTTP2_ENABLED
+            )
+        )
         self.model = Config.OPENROUTER_MODEL
+        self.cache = PlanCache(Config.PLAN_CACHE_FILE, Config.PLAN_CACHE_SIZE, Config.PLAN_CACHE_TTL)
     
-    def analyze_task(self, task_content: str, task_filename: str) -> Tuple[str, str, bool]:
-        """
-        Send task to OpenRouter API for analysis.
-        Returns: (plan_content, risk_level, requires_approval)
-        """
-        system_prompt = """You are a Personal AI Employee. Analyze this task and create a step-by-step action plan in markdown with checkboxes. 
-If task involves money, emails to unknown contacts, or deletions — mark as HIGH RISK and flag for human approval."""
-        
+    async def warm_up(self):
+        """Open the TLS connection ahead of the first task with a free models listing."""
+        try:
+            await self.async_client.models.list()
+        except Exception as e:
+            print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} OpenRouter warm-up failed: {e}")
+    
+    async def aclose(self):
+        """Close the async client's connection pool."""
+        await self.async_client.close()
+    
+    def _build_messages(self, task_content: str, task_filename: str) -> list:
+        """Build the chat messages for a task analysis request."""
         user_prompt = f"""Task file: {task_filename}
 
 Task content:
@@ -87,16 +331,180 @@ Please create a detailed action plan with:
 
 Format your response as valid markdown."""
 
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _build_batch_messages(self, tasks: list) -> list:
+        """Build the chat messages for analyzing several (content, filename) tasks in one request."""
+        sections = "\n".join(
+            f"### TASK {i}: {filename}\n{content}\n" for i, (content, filename) in enumerate(tasks)
+        )
+        user_prompt = f"""Analyze each of the following {len(tasks)} tasks separately.
+
+{sections}
+For every task create a detailed action plan in markdown with:
+1. Clear objective (## Objective)
+2. Step-by-step actions with checkboxes (## Steps)
+3. Risk assessment (## Risk Assessment, LOW/MEDIUM/HIGH)
+4. Whether human approval is required
+
+Respond with a JSON object of the form
+{{"plans": [{{"index": 0, "plan": "<markdown plan>", "risk": "LOW|MEDIUM|HIGH", "approval": true}}]}}
+containing one entry per task."""
+
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _parse_batch_response(self, content: str, count: int) -> dict:
+        """Map task index to (plan_content, risk_level, requires_approval) for each usable entry."""
+        try:
+            entries = json.loads(content).get("plans", [])
+        except (json.JSONDecodeError, AttributeError):
+            return {}
+        
+        results = {}
+        for entry in entries:
+            try:
+                index = int(entry["index"])
+                plan_content = str(entry["plan"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= index < count:
+                continue
+            
+            # Take the stricter of the model's own rating and the parsed plan text
+            risk_level, requires_approval = self._parse_risk_assessment(plan_content)
+            stated = str(entry.get("risk", "")).upper()
+            stated = "MEDIUM" if stated == "MED" else stated
+            if stated in _RISK_ORDER and _RISK_ORDER.index(stated) > _RISK_ORDER.index(risk_level):
+                risk_level = stated
+            requires_approval = requires_approval or entry.get("approval") is True or risk_level == "HIGH"
+            
+            results[index] = (plan_content, risk_level, requires_approval)
+        return results
+    
+    def _split_cached(self, tasks: list) -> Tuple[list, list, list]:
+        """Return (results, cache_keys, uncached_indexes) for a batch of tasks."""
+        results, keys, pending = [], [], []
+        for i, (content, _filename) in enumerate(tasks):
+            key = self._cache_key(content)
+            cached = self.cache.get(key) if key else None
+            results.append(cached)
+            keys.append(key)
+            if cached is None:
+                pending.append(i)
+        return results, keys, pending
+    
+    def _store_batch(self, results: list, keys: list, pending: list, parsed: dict):
+        """Fill results from a parsed batch response and cache them."""
+        for j, i in enumerate(pending):
+            if j in parsed:
+                results[i] = parsed[j]
+                if keys[i]:
+                    self.cache.put(keys[i], parsed[j])
+    
+    def analyze_tasks_batch(self, tasks: list) -> list:
+        """
+        Analyze several tasks with a single API request.
+        
+        Args:
+            tasks: List of (task_content, task_filename) tuples
+        
+        Returns:
+            List of (plan_content, risk_level, requires_approval), in task order.
+            Tasks missing from the batch response are analyzed one by one.
+        """
+        results, keys, pending = self._split_cached(tasks)
+        
+        if len(pending) > 1:
+            batch = [tasks[i] for i in pending]
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_batch_messages(batch),
+                    temperature=0.7,
+                    max_tokens=2000 * len(batch),
+                    response_format={"type": "json_object"}
+                )
+                self._store_batch(results, keys, pending, self._parse_batch_response(response.choices[0].message.content, len(batch)))
+            except Exception as e:
+                print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Batch analysis failed, analyzing tasks individually: {e}")
+        
+        for i, (content, filename) in enumerate(tasks):
+            if results[i] is None:
+                results[i] = self.analyze_task(content, filename)
+        return results
+    
+    async def analyze_tasks_batch_async(self, tasks: list) -> list:
+        """
+        Async variant of analyze_tasks_batch.
+        
+        Args:
+            tasks: List of (task_content, task_filename) tuples
+        
+        Returns:
+            List of (plan_content, risk_level, requires_approval), in task order
+        """
+        results, keys, pending = await asyncio.to_thread(self._split_cached, tasks)
+        
+        if len(pending) > 1:
+            batch = [tasks[i] for i in pending]
+            try:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_batch_messages(batch),
+                    temperature=0.7,
+                    max_tokens=2000 * len(batch),
+                    response_format={"type": "json_object"}
+                )
+                parsed = self._parse_batch_response(response.choices[0].message.content, len(batch))
+                await asyncio.to_thread(self._store_batch, results, keys, pending, parsed)
+            except Exception as e:
+                print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Batch analysis failed, analyzing tasks individually: {e}")
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        singles = await asyncio.gather(*(self.analyze_task_async(*tasks[i]) for i in missing))
+        for i, result in zip(missing, singles):
+            results[i] = result
+        return results
+    
+    def _cache_key(self, task_content: str) -> Optional[str]:
+        """Cache key for a task, or None if its frontmatter opts out of caching."""
+        if _NO_CACHE_RE.search(task_content):
+            return None
+        # Fed piecewise so large task files are not copied into one joined string first
+        h = hashlib.sha256()
+        h.update(self.model.encode("utf-8"))
+        h.update(b"|")
+        h.update(self.SYSTEM_PROMPT.encode("utf-8"))
+        h.update(b"|")
+        h.update(task_content.encode("utf-8", "ignore"))
+        return h.hexdigest()
+    
+    def analyze_task(self, task_content: str, task_filename: str) -> Tuple[str, str, bool]:
+        """
+        Send task to OpenRouter API for analysis.
+        Returns: (plan_content, risk_level, requires_approval)
+        """
+        cache_key = self._cache_key(task_content)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached:
+                print(f"{Fore.GREEN}[CACHE]{Style.RESET_ALL} Reusing plan for identical task: {task_filename}")
+                return cached
+        
+        messages = self._build_messages(task_content, task_filename)
         last_error = None
         
         for attempt in range(Config.MAX_RETRIES):
             try:
                 response = self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
+                    messages=messages,
                     temperature=0.7,
                     max_tokens=2000
                 )
@@ -106,6 +514,8 @@ Format your response as valid markdown."""
                 # Parse risk level and approval requirement from response
                 risk_level, requires_approval = self._parse_risk_assessment(plan_content)
                 
+                if cache_key:
+                    self.cache.put(cache_key, (plan_content, risk_level, requires_approval))
                 return plan_content, risk_level, requires_approval
                 
             except openai.APIError as e:
@@ -122,32 +532,105 @@ Format your response as valid markdown."""
         # All retries exhausted
         raise Exception(f"OpenRouter API failed after {Config.MAX_RETRIES} attempts: {last_error}")
     
-    def _parse_risk_assessment(self, content: str) -> Tuple[str, bool]:
-        """Parse risk level and approval requirement from AI response."""
-        content_upper = content.upper()
+    async def analyze_task_async(self, task_content: str, task_filename: str) -> Tuple[str, str, bool]:
+        """
+        Async variant of analyze_task, so several tasks can be analyzed at once.
+        The response is streamed, and a HIGH risk marker is reported as soon as it arrives.
+        Returns: (plan_content, risk_level, requires_approval)
+        """
+        cache_key = self._cache_key(task_content)
+        if cache_key:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached:
+                print(f"{Fore.GREEN}[CACHE]{Style.RESET_ALL} Reusing plan for identical task: {task_filename}")
+                return cached
         
-        # Determine risk level
-        if "HIGH RISK" in content_upper or "RISK_LEVEL: HIGH" in content_upper or "**HIGH**" in content_upper:
-            risk_level = "HIGH"
-        elif "MEDIUM" in content_upper or "RISK_LEVEL: MEDIUM" in content_upper:
-            risk_level = "MEDIUM"
-        else:
-            risk_level = "LOW"
-        
-        # Determine if approval is required
-        requires_approval = (
-            "REQUIRES APPROVAL: YES" in content_upper or
-            "REQUIRES APPROVAL: TRUE" in content_upper or
-            "FLAG FOR HUMAN APPROVAL" in content_upper or
-            "HUMAN APPROVAL REQUIRED" in content_upper or
-            (risk_level == "HIGH" and ("YES" in content_upper.split("APPROVAL")[-1] if "APPROVAL" in content_upper else False))
-        )
+        messages = self._build_messages(task_content, task_filename)
+        last_error = None
+        
+        for attempt in range(Config.MAX_RETRIES):
+            try:
+                stream = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2000,
+                    stream=True
+                )
+                
+                chunks = []
+                window = ""
+                high_seen = False
+                async for event in stream:
+                    if not event.choices:
+                        continue
+                    delta = event.choices[0].delta.content
+                    if not delta:
+                        continue
+                    chunks.append(delta)
+                    
+                    if not high_seen:
+                        window = window[-_MARKER_OVERLAP:] + delta
+                        if _HIGH_MARKER_RE.search(window):
+                            high_seen = True
+                            print(f"{Fore.RED}[RISK]{Style.RESET_ALL} HIGH risk flagged while analyzing {task_filename}")
+                
+                plan_content = "".join(chunks)
+                risk_level, requires_approval = self._parse_risk_assessment(plan_content)
+                
+                if cache_key:
+                    await asyncio.to_thread(self.cache.put, cache_key, (plan_content, risk_level, requires_approval))
+                return plan_content, risk_level, requires_approval
+                
+            except openai.APIError as e:
+                last_error = e
+                print(f"{Fore.YELLOW}[RETRY]{Style.RESET_ALL} API error (attempt {attempt + 1}/{Config.MAX_RETRIES}): {e}")
+                if attempt < Config.MAX_RETRIES - 1:
+                    await asyncio.sleep(Config.RETRY_DELAY)
+            except Exception as e:
+                last_error = e
+                print(f"{Fore.YELLOW}[RETRY]{Style.RESET_ALL} Unexpected error (attempt {attempt + 1}/{Config.MAX_RETRIES}): {e}")
+                if attempt < Config.MAX_RETRIES - 1:
+                    await asyncio.sleep(Config.RETRY_DELAY)
         
-        # Additional check for HIGH RISK tasks
-        if risk_level == "HIGH":
-            requires_approval = True
+        # All retries exhausted
+        raise Exception(f"OpenRouter API failed after {Config.MAX_RETRIES} attempts: {last_error}")
+    
+    def _parse_risk_assessment(self, content: str) -> Tuple[str, bool]:
+        """Parse risk level and approval requirement from AI response."""
+        tags = set()
+        for match in _RISK_MARKER_RE.finditer(content):
+            tag = _RISK_MARKERS[match.group(0).upper()]
+            # HIGH RISK tasks always require approval, nothing else can change the result
+            if tag == "HIGH":
+                return "HIGH", True
+            tags.add(tag)
         
-        return risk_level, requires_approval
+        risk_level = "MEDIUM" if "MEDIUM" in tags else "LOW"
+        return risk_level, "APPROVAL" in tags
+
+
+class NeedsActionHandler(FileSystemEventHandler):
+    """Forwards new task files in Needs_Action to the orchestrator's event loop."""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        super().__init__()
+        self.loop = loop
+        self.queue = queue
+    
+    def _enqueue(self, path: str):
+        if path.endswith(".md"):
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, Path(path))
+    
+    def on_created(self, event):
+        """Handle task files written into Needs_Action."""
+        if not event.is_directory:
+            self._enqueue(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle task files renamed into Needs_Action."""
+        if not event.is_directory:
+            self._enqueue(event.dest_path)
 
 
 class TaskOrchestrator:
@@ -156,6 +639,9 @@ class TaskOrchestrator:
     def __init__(self):
         self.openrouter_client: Optional[OpenRouterClient] = None
         self.processed_files = set()
+        self._processed_order = deque(maxlen=Config.PROCESSED_HISTORY)
+        # Created once here rather than on every plan/move/copy/log call
+        ensure_directories()
         self._init_openrouter_client()
     
     def _init_openrouter_client(self):
@@ -168,6 +654,15 @@ class TaskOrchestrator:
             print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Running without AI analysis. Tasks will be logged only.")
             self.openrouter_client = None
     
+    def _mark_processed(self, path: str):
+        """Remember a processed task, forgetting the oldest beyond PROCESSED_HISTORY."""
+        if path in self.processed_files:
+            return
+        if len(self._processed_order) == self._processed_order.maxlen:
+            self.processed_files.discard(self._processed_order[0])
+        self._processed_order.append(path)
+        self.processed_files.add(path)
+    
     def scan_needs_action(self) -> list:
         """Scan Needs_Action directory for new task files."""
         try:
@@ -175,12 +670,16 @@ class TaskOrchestrator:
                 Config.NEEDS_ACTION_DIR.mkdir(parents=True, exist_ok=True)
                 return []
             
+            # scandir yields the file type with each entry, so only candidates get stat'ed
             task_files = []
-            for file_path in Config.NEEDS_ACTION_DIR.glob("*.md"):
-                if str(file_path) not in self.processed_files:
-                    task_files.append(file_path)
+            with os.scandir(Config.NEEDS_ACTION_DIR) as entries:
+                for entry in entries:
+                    if (entry.name.endswith(".md") and not entry.name.startswith(".")
+                            and entry.path not in self.processed_files and entry.is_file()):
+                        task_files.append((entry.stat().st_mtime, entry.path))
             
-            return sorted(task_files, key=lambda x: x.stat().st_mtime)
+            task_files.sort()
+            return [Path(path) for _, path in task_files]
             
         except Exception as e:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to scan Needs_Action: {e}")
@@ -193,85 +692,79 @@ class TaskOrchestrator:
         except Exception as e:
             raise Exception(f"Failed to read task file: {e}")
     
-    def create_plan_file(self, task_filename: str, plan_content: str, risk_level: str, requires_approval: bool) -> Path:
-        """Create a plan file in the Plans directory."""
+    def create_plan_file(self, task_filename: str, plan_content: str, risk_level: str, requires_approval: bool,
+                         now: Optional[datetime] = None) -> Path:
+        """Create a plan file in the Plans directory, stamped with now (default: current time)."""
         try:
-            # Ensure Plans directory exists
-            Config.PLANS_DIR.mkdir(parents=True, exist_ok=True)
+            now = now or datetime.now()
             
             # Generate plan filename
-            safe_name = re.sub(r'[^\w\-_]', '_', task_filename.replace('.md', ''))
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            safe_name = _SAFE_NAME_RE.sub('_', task_filename.replace('.md', ''))
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             plan_filename = f"PLAN_{safe_name}_{timestamp}.md"
             plan_path = Config.PLANS_DIR / plan_filename
             
             # Create plan content with frontmatter
-            created_timestamp = datetime.now().isoformat()
+            created_timestamp = now.isoformat()
             
             # Extract sections from AI response or create defaults
-            objective_match = re.search(r'## Objective\s*\n(.*?)(?=##|\Z)', plan_content, re.DOTALL | re.IGNORECASE)
+            objective_match = _OBJECTIVE_RE.search(plan_content)
             objective = objective_match.group(1).strip() if objective_match else "Analyze and complete the task."
             
-            steps_match = re.search(r'## Steps?\s*\n(.*?)(?=##|\Z)', plan_content, re.DOTALL | re.IGNORECASE)
+            steps_match = _STEPS_RE.search(plan_content)
             steps = steps_match.group(1).strip() if steps_match else "- [ ] Review task details\n- [ ] Execute required actions"
             
-            risk_match = re.search(r'## Risk Assessment\s*\n(.*?)(?=##|\Z)', plan_content, re.DOTALL | re.IGNORECASE)
+            risk_match = _RISK_RE.search(plan_content)
             risk_assessment = risk_match.group(1).strip() if risk_match else f"Risk Level: {risk_level}"
             
-            formatted_content = f"""---
-created: {created_timestamp}
-risk_level: {risk_level}
-status: pending
----
-## Objective
-{objective}
-
-## Steps
-{steps}
-
-## Risk Assessment
-{risk_assessment}
-
-## Requires Approval: {"YES" if requires_approval else "NO"}
-
----
-## Full AI Analysis
-{plan_content}
-"""
+            formatted_content = _PLAN_TEMPLATE.format_map({
+                "created": created_timestamp,
+                "risk_level": risk_level,
+                "objective": objective,
+                "steps": steps,
+                "risk_assessment": risk_assessment,
+                "approval": "YES" if requires_approval else "NO",
+                "plan_content": plan_content,
+            })
             
-            plan_path.write_text(formatted_content, encoding="utf-8")
+            if Config.DURABLE_WRITES:
+                _write_durable(plan_path, formatted_content.encode("utf-8"))
+            else:
+                plan_path.write_bytes(formatted_content.encode("utf-8"))
             
             return plan_path
             
         except Exception as e:
             raise Exception(f"Failed to create plan file: {e}")
     
-    def move_to_done(self, task_file: Path):
-        """Move processed task file to Done directory."""
+    def move_to_done(self, task_file: Path, now: Optional[datetime] = None):
+        """Move processed task file to Done directory, prefixed with now (default: current time)."""
         try:
-            Config.DONE_DIR.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
             new_name = f"{timestamp}_{task_file.name}"
             dest_path = Config.DONE_DIR / new_name
             
-            shutil.move(str(task_file), str(dest_path))
+            # Single rename(2) within the vault; shutil.move copes with cross-device setups
+            try:
+                os.replace(task_file, dest_path)
+            except OSError:
+                shutil.move(str(task_file), str(dest_path))
             
             return dest_path
             
         except Exception as e:
             raise Exception(f"Failed to move file to Done: {e}")
     
-    def copy_to_pending_approval(self, plan_file: Path, task_file: Path):
-        """Copy high-risk items to Pending_Approval directory."""
+    def copy_to_pending_approval(self, plan_file: Path, task_file: Path, now: Optional[datetime] = None):
+        """Copy high-risk items to Pending_Approval directory, prefixed with now (default: current time)."""
         try:
-            Config.PENDING_APPROVAL_DIR.mkdir(parents=True, exist_ok=True)
-            
             # Copy the plan file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
             dest_name = f"{timestamp}_{plan_file.name}"
             dest_path = Config.PENDING_APPROVAL_DIR / dest_name
             
+            # Real copies, not links: reviewers edit these in place, and that
+            # must not rewrite the Plans/ record or the Done/ archive
             shutil.copy2(str(plan_file), str(dest_path))
             
             # Also copy original task file if it still exists
@@ -284,88 +777,90 @@ status: pending
         except Exception as e:
             raise Exception(f"Failed to copy to Pending_Approval: {e}")
     
-    def log_event(self, event_type: str, data: dict):
-        """Log an event to the daily JSON log file."""
+    def log_event(self, event_type: str, data: dict, now: Optional[datetime] = None):
+        """Append an event to the daily JSON Lines log file, timestamped now (default: current time)."""
         try:
-            Config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+            now = now or datetime.now()
+            today = now.strftime("%Y-%m-%d")
+            log_file = Config.LOGS_DIR / f"{today}.jsonl"
             
-            today = datetime.now().strftime("%Y-%m-%d")
-            log_file = Config.LOGS_DIR / f"{today}.json"
-            
-            logs = []
-            if log_file.exists():
-                try:
-                    logs = json.loads(log_file.read_text(encoding="utf-8"))
-                except (json.JSONDecodeError, Exception):
-                    logs = []
-            
-            logs.append({
+            entry = _json_dumps({
                 "type": event_type,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "data": data
             })
             
-            log_file.write_text(json.dumps(logs, indent=2), encoding="utf-8")
+            # One unbuffered write per line in append mode, so concurrent writers never interleave
+            with log_file.open("ab", buffering=0) as f:
+                f.write(entry + b"\n")
+                if Config.DURABLE_WRITES:
+                    os.fsync(f.fileno())
             
         except Exception as e:
             print(f"{Fore.RED}[LOG ERROR]{Style.RESET_ALL} Failed to log event: {e}")
     
-    def process_task(self, task_file: Path):
-        """Process a single task file."""
+    async def process_task(self, task_file: Path, analysis: Optional[Tuple[str, str, bool]] = None):
+        """
+        Process a single task file; blocking file I/O runs in worker threads.
+        
+        Args:
+            task_file: Task file in Needs_Action
+            analysis: (plan_content, risk_level, requires_approval) already obtained
+                from a batch request, or None to analyze the task here
+        """
         try:
             filename = task_file.name
+            # One timestamp for the plan, approval copies, Done file and log entry
+            now = datetime.now()
             
             print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             print(f"{Fore.GREEN}[PROCESSING]{Style.RESET_ALL} Task: {Fore.YELLOW}{filename}{Style.RESET_ALL}")
             
-            # Read task content
-            task_content = self.read_task_file(task_file)
+            # Read task content (already done for batch-analyzed tasks)
+            if analysis is None:
+                task_content = await asyncio.to_thread(self.read_task_file, task_file)
             
             # Send to OpenRouter API for analysis
-            if self.openrouter_client:
-                plan_content, risk_level, requires_approval = self.openrouter_client.analyze_task(
+            if analysis:
+                plan_content, risk_level, requires_approval = analysis
+            elif self.openrouter_client:
+                plan_content, risk_level, requires_approval = await self.openrouter_client.analyze_task_async(
                     task_content, filename
                 )
             else:
                 # Fallback without AI
-                plan_content = f"""## Objective
-Review and complete the task: {filename}
-
-## Steps
-- [ ] Review task details
-- [ ] Execute required actions
-- [ ] Document results
-
-## Risk Assessment
-Risk Level: MEDIUM (AI analysis unavailable)
-
-## Requires Approval: NO
-"""
-                risk_level = "MEDIUM"
-                requires_approval = False
+                plan_content = _FALLBACK_PLAN % filename
+                risk_level, requires_approval = _FALLBACK_RISK
             
             # Create plan file
-            plan_file = self.create_plan_file(filename, plan_content, risk_level, requires_approval)
+            plan_file = await asyncio.to_thread(self.create_plan_file, filename, plan_content, risk_level, requires_approval, now)
             print(f"{Fore.GREEN}[CREATED]{Style.RESET_ALL} Plan: {Fore.BLUE}{plan_file.name}{Style.RESET_ALL}")
             
             # Handle high-risk tasks
             if requires_approval or risk_level == "HIGH":
-                approval_file = self.copy_to_pending_approval(plan_file, task_file)
+                approval_file = await asyncio.to_thread(self.copy_to_pending_approval, plan_file, task_file, now)
                 print(f"{Fore.RED}[HIGH RISK]{Style.RESET_ALL} Copied to Pending_Approval: {Fore.RED}{approval_file.name}{Style.RESET_ALL}")
             
             # Move task to Done
-            done_file = self.move_to_done(task_file)
-            self.processed_files.add(str(task_file))
+            done_file = await asyncio.to_thread(self.move_to_done, task_file, now)
+            self._mark_processed(str(task_file))
             print(f"{Fore.GREEN}[COMPLETE]{Style.RESET_ALL} Moved to Done: {Fore.BLUE}{done_file.name}{Style.RESET_ALL}")
             
             # Log the event
-            self.log_event("task_processed", {
+            await asyncio.to_thread(self.log_event, "task_processed", {
                 "task_file": filename,
                 "plan_file": plan_file.name,
                 "risk_level": risk_level,
                 "requires_approval": requires_approval,
                 "done_file": done_file.name
-            })
+            }, now)
+            
+            # One directory fsync each for everything this task created, renamed or removed
+            if Config.DURABLE_WRITES:
+                touched = {Config.PLANS_DIR, Config.DONE_DIR, task_file.parent, Config.LOGS_DIR}
+                if requires_approval or risk_level == "HIGH":
+                    touched.add(Config.PENDING_APPROVAL_DIR)
+                await asyncio.to_thread(_fsync_dirs, touched)
             
             # Print risk summary
             if risk_level == "HIGH":
@@ -379,37 +874,177 @@ Risk Level: MEDIUM (AI analysis unavailable)
             
         except Exception as e:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Failed to process task {task_file.name}: {e}")
-            self.log_event("task_error", {
+            await asyncio.to_thread(self.log_event, "task_error", {
                 "task_file": task_file.name,
                 "error": str(e)
             })
     
-    def run(self):
-        """Main run loop."""
-        print(f"{Fore.GREEN}[START]{Style.RESET_ALL} Orchestrator running. Polling every {Config.POLL_INTERVAL}s...")
+    def _start_watcher(self, queue: asyncio.Queue):
+        """Start a watchdog observer on Needs_Action, or return None if unavailable."""
+        if not WATCHDOG_AVAILABLE:
+            return None
+        
+        try:
+            Config.NEEDS_ACTION_DIR.mkdir(parents=True, exist_ok=True)
+            observer = Observer()
+            observer.schedule(NeedsActionHandler(asyncio.get_running_loop(), queue), str(Config.NEEDS_ACTION_DIR), recursive=False)
+            observer.start()
+            return observer
+        except Exception as e:
+            print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} File watcher unavailable, falling back to polling: {e}")
+            return None
+    
+    async def _next_tasks(self, queue: asyncio.Queue) -> list:
+        """
+        Wait for task file events and return the new tasks.
+        
+        Falls back to a full scan if nothing arrives within POLL_INTERVAL, so
+        missed events (or running without watchdog) still get picked up.
+        """
+        try:
+            first = await asyncio.wait_for(queue.get(), timeout=Config.POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            return await asyncio.to_thread(self.scan_needs_action)
+        
+        # Let the writer finish, then take everything that arrived meanwhile
+        await asyncio.sleep(Config.EVENT_SETTLE_DELAY)
+        paths = {first}
+        while not queue.empty():
+            paths.add(queue.get_nowait())
+        
+        return await asyncio.to_thread(self._pending_from_events, paths)
+    
+    def _pending_from_events(self, paths: set) -> list:
+        """Filter event paths down to unprocessed task files that still exist, oldest first."""
+        tasks = []
+        for path in paths:
+            if str(path) in self.processed_files:
+                continue
+            try:
+                tasks.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        tasks.sort()
+        return [path for _, path in tasks]
+    
+    async def _analyze_in_batches(self, tasks: list, semaphore: asyncio.Semaphore) -> dict:
+        """
+        Analyze tasks ANALYSIS_BATCH_SIZE at a time.
+        
+        Returns:
+            Dict of task path to analysis; tasks that could not be read or
+            analyzed are left out and handled by process_task.
+        """
+        async def read(task_file: Path) -> Optional[str]:
+            try:
+                return await asyncio.to_thread(self.read_task_file, task_file)
+            except Exception:
+                return None
+        
+        texts = await asyncio.gather(*(read(task_file) for task_file in tasks))
+        contents = {task_file: text for task_file, text in zip(tasks, texts) if text is not None}
+        
+        readable = list(contents)
+        size = Config.ANALYSIS_BATCH_SIZE
+        
+        async def analyze_chunk(chunk: list) -> dict:
+            async with semaphore:
+                try:
+                    results = await self.openrouter_client.analyze_tasks_batch_async(
+                        [(contents[task_file], task_file.name) for task_file in chunk]
+                    )
+                except Exception as e:
+                    print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} Batch of {len(chunk)} task(s) failed: {e}")
+                    return {}
+                return dict(zip(chunk, results))
+        
+        analyses = {}
+        chunks = [readable[i:i + size] for i in range(0, len(readable), size)]
+        for result in await asyncio.gather(*(analyze_chunk(chunk) for chunk in chunks)):
+            analyses.update(result)
+        return analyses
+    
+    async def process_tasks(self, tasks: list):
+        """Process a batch of tasks concurrently, at most MAX_CONCURRENCY at a time."""
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENCY)
+        
+        analyses = {}
+        if self.openrouter_client and Config.ANALYSIS_BATCH_SIZE > 1 and len(tasks) > 1:
+            analyses = await self._analyze_in_batches(tasks, semaphore)
+        
+        async def process_one(task_file: Path):
+            async with semaphore:
+                await self.process_task(task_file, analyses.get(task_file))
+        
+        await asyncio.gather(*(process_one(task_file) for task_file in tasks))
+    
+    async def run(self):
+        """Main run loop: process existing tasks, then react to new ones as they appear."""
+        # Every asyncio.to_thread call shares this pool; asyncio.run shuts it down on exit
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=Config.IO_WORKERS, thread_name_prefix="orch-io")
+        )
+        
+        queue = asyncio.Queue()
+        observer = self._start_watcher(queue)
+        
+        if observer:
+            print(f"{Fore.GREEN}[START]{Style.RESET_ALL} Orchestrator running. Watching {Config.NEEDS_ACTION_DIR} for new tasks...")
+        else:
+            print(f"{Fore.GREEN}[START]{Style.RESET_ALL} Orchestrator running. Polling every {Config.POLL_INTERVAL}s...")
         print(f"{Fore.GREEN}[START]{Style.RESET_ALL} Press Ctrl+C to stop.\n")
         
-        while True:
+        if self.openrouter_client:
+            await self.openrouter_client.warm_up()
+        
+        # Startup sweep for tasks that were queued before the watcher started
+        tasks = await asyncio.to_thread(self.scan_needs_action)
+        
+        try:
+            while True:
+                try:
+                    if tasks:
+                        print(f"{Fore.GREEN}[FOUND]{Style.RESET_ALL} {len(tasks)} new task(s) to process.")
+                        await self.process_tasks(tasks)
+                    
+                    tasks = await self._next_tasks(queue)
+                    
+                except Exception as e:
+                    print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Loop error: {e}")
+                    await asyncio.to_thread(self.log_event, "orchestrator_error", {"error": str(e)})
+                    await asyncio.sleep(Config.POLL_INTERVAL)
+                    tasks = await asyncio.to_thread(self.scan_needs_action)
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            if self.openrouter_client:
+                await self.openrouter_client.aclose()
+
+
+def read_log(day: str):
+    """
+    Iterate over the orchestrator events logged on a day.
+    
+    Args:
+        day: Date as YYYY-MM-DD
+    
+    Yields:
+        Event dicts with type, timestamp and data
+    """
+    log_file = Config.LOGS_DIR / f"{day}.jsonl"
+    if not log_file.exists():
+        return
+    
+    with log_file.open("rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
             try:
-                # Scan for new tasks
-                tasks = self.scan_needs_action()
-                
-                if tasks:
-                    print(f"{Fore.GREEN}[FOUND]{Style.RESET_ALL} {len(tasks)} new task(s) to process.")
-                    for task_file in tasks:
-                        self.process_task(task_file)
-                else:
-                    # Print idle status (without cluttering)
-                    pass
-                
-                time.sleep(Config.POLL_INTERVAL)
-                
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Loop error: {e}")
-                self.log_event("orchestrator_error", {"error": str(e)})
-                time.sleep(Config.POLL_INTERVAL)
+                yield _json_loads(line)
+            except ValueError:
+                continue
 
 
 def print_banner():
@@ -475,7 +1110,7 @@ def main():
         
         # Create and run orchestrator
         orchestrator = TaskOrchestrator()
-        orchestrator.run()
+        asyncio.run(orchestrator.run())
         
     except KeyboardInterrupt:
         signal_handler(signal.SIGINT, None)
@@ -488,5 +1123,9 @@ if __name__ == "__main__":
     main()
 
 # pip install openai colorama python-dotenv
+# Optional: pip install orjson  (faster event log serialization)
+# Optional: pip install watchdog  (instant task pickup instead of polling)
 # Set env: OPENROUTER_API_KEY=your_key_here
 # Optional: OPENROUTER_MODEL=anthropic/claude-3.5-sonnet (default: openai/gpt-4o-mini)
+# Optional: DURABLE_WRITES=1 to fsync plans, logs and vault directories after each task
+# Optional: ANALYSIS_BATCH_SIZE=5 to analyze several queued tasks per API request
@@ -14,18 +14,40 @@ Usage:
 """
 
 import os
+import re
 import json
 import time
+import hashlib
+import uuid
+import sqlite3
+import atexit
+import asyncio
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Optional, List, Dict, Any, Union
+from typing import Callable, Optional, List, Dict, Any, Tuple, Union
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 
-# Initialize colorama
-init(autoreset=True)
+# Optional: httpx for concurrent loops (run_async falls back to worker threads)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Optional: orjson for faster request/response serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
@@ -42,6 +64,12 @@ PENDING_DIR = BASE_DIR / "Pending_Approval"
 for directory in [LOGS_DIR, NEEDS_ACTION_DIR, DONE_DIR, APPROVED_DIR, PENDING_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Long-lived, buffered log handle; flushed on errors, successes and exit
+_LOG_FH = open(LOGS_DIR / "ralph_loop.log", "a", encoding="utf-8", buffering=8192)
+_LOG_LOCK = threading.Lock()
+_FLUSH_LEVELS = frozenset(["ERROR", "SUCCESS"])
+atexit.register(_LOG_FH.close)
+
 # Qwen/OpenAI configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
@@ -50,6 +78,328 @@ OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet")
 # Ralph-specific configuration
 RALPH_TEMPERATURE = 0.3  # Low temperature for consistent, focused output
 RALPH_MAX_TOKENS = 4000  # High token limit for detailed work
+RALPH_MEMORY_WINDOW = 3  # Iterations kept verbatim in the prompt; older ones are summarized
+
+# Request budget for concurrent async loops (0 = unlimited)
+RALPH_RPM = int(os.getenv("RALPH_RPM", "60"))  # Requests per minute
+RALPH_TPM = int(os.getenv("RALPH_TPM", "0"))  # Estimated tokens per minute
+RALPH_CONCURRENCY = int(os.getenv("RALPH_CONCURRENCY", "8"))  # Loops in flight for process_needs_action
+
+# Timestamp format for log lines, iteration logs and failure alerts
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Completion tag; responses are streamed and the stream is closed once it arrives
+_COMPLETE_TAG = "<TASK_COMPLETE>"
+_TAG_OVERLAP = len(_COMPLETE_TAG) - 1
+
+# Fixed continuation prompt: identical every iteration so the conversation
+# prefix stays byte-identical and can be served from the provider's prompt cache
+_CONTINUATION_PROMPT = (
+    "Continue working on the task. You have not finished yet. "
+    "Review your previous work above and keep making progress. "
+    "When the task is 100% complete, end with <TASK_COMPLETE>."
+)
+
+# Anthropic models on OpenRouter only cache prompts marked with cache_control
+_PROMPT_CACHE_CONTROL = OPENROUTER_MODEL.startswith("anthropic/")
+
+# Prompt used to fold older iterations into a short progress summary
+_SUMMARY_PROMPT = (
+    "Summarize the progress on the task in the conversation above as a few concise bullet points: "
+    "what has been done, key results so far, and what remains. Output only the summary."
+)
+
+# Batch tool: one response can request several file operations, run concurrently
+_BATCH_RE = re.compile(r"<batch>(.*?)</batch>", re.DOTALL)
+_BATCH_MAX_INVOCATIONS = 32
+_BATCH_TOOL_PROMPT = """
+
+BATCH TOOL:
+You can read and write files in the vault folders /Needs_Action/, /Done/ and
+/Pending_Approval/ (paths like /Needs_Action/file.md), and move files out of /Needs_Action/.
+To request several operations in one turn, include a single block:
+<batch>{"invocations": [{"tool_name": "read_file", "arguments": {"path": "/Needs_Action/a.md"}}, ...]}</batch>
+Available tools:
+- read_file: {"path": ...} returns the file's text
+- write_file: {"path": ..., "content": ...} creates or replaces a file
+- move_to_done: {"path": ...} moves a /Needs_Action/ file into /Done/
+All invocations run at the same time; their results come back in the next message."""
+
+# Failure alerts land in Needs_Action for a human; process_needs_action leaves them alone
+_FAILURE_ALERT_PREFIX = "RALPH_FAILED_"
+
+# Shared HTTP session so every iteration reuses the keep-alive TLS connection to OpenRouter
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"])
+    )
+))
+atexit.register(_SESSION.close)
+
+# Connection limits for the shared async client used by RalphLoop.run_many
+_ASYNC_MAX_CONNECTIONS = 200
+_ASYNC_MAX_KEEPALIVE = 100
+
+# Persistent cache of responses keyed on the exact request payload
+_CACHE_PATH = BASE_DIR / ".ralph_cache.sqlite"
+_CACHE_TTL = 7 * 24 * 3600
+_CACHE_LOCK = threading.Lock()
+_CACHE_DB: Optional[sqlite3.Connection] = None
+
+
+def _response_cache_key(payload: Dict[str, Any]) -> str:
+    """Hash of model, temperature and messages for the response cache."""
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _cache_db() -> sqlite3.Connection:
+    """Open the response cache database on first use."""
+    global _CACHE_DB
+    if _CACHE_DB is None:
+        db = sqlite3.connect(str(_CACHE_PATH), check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT, ts REAL)")
+        db.commit()
+        _CACHE_DB = db
+    return _CACHE_DB
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return a cached response younger than _CACHE_TTL, or None."""
+    try:
+        with _CACHE_LOCK:
+            row = _cache_db().execute("SELECT content, ts FROM responses WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if row and time.time() - row[1] <= _CACHE_TTL:
+        return row[0]
+    return None
+
+
+def _cache_put(key: str, content: str):
+    """Store a response in the cache; failures only cost the cache entry."""
+    try:
+        with _CACHE_LOCK:
+            db = _cache_db()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, content, time.time()))
+            db.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _cache_delete(keys: List[str]):
+    """Drop cached responses, e.g. those of a run that never completed."""
+    try:
+        with _CACHE_LOCK:
+            db = _cache_db()
+            db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in keys])
+            db.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _sse_delta(line: str) -> Optional[str]:
+    """
+    Content carried by one server-sent event line of a streamed completion.
+    
+    Returns:
+        The text delta ("" for keep-alives and non-content events), or None
+        once the stream signals it is done
+    """
+    if not line.startswith("data:"):
+        return ""
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return None
+    
+    event = _json_loads(data)
+    if "error" in event:
+        error = event["error"]
+        raise RuntimeError(error.get("message", error) if isinstance(error, dict) else error)
+    choices = event.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+class _StreamCollector:
+    """Accumulates streamed deltas and spots the completion tag across chunk boundaries."""
+    
+    def __init__(self):
+        self.chunks: List[str] = []
+        self._window = ""
+    
+    def add(self, delta: str) -> bool:
+        """Add a delta; returns True once the completion tag has arrived."""
+        self.chunks.append(delta)
+        self._window = self._window[-_TAG_OVERLAP:] + delta
+        return _COMPLETE_TAG in self._window
+    
+    def text(self) -> str:
+        return "".join(self.chunks).strip()
+
+
+class _RateLimiter:
+    """
+    Sliding one-minute window of requests and estimated tokens.
+    
+    Shared by every async loop with the same limits, so concurrent loops
+    wait for capacity instead of running into 429s.
+    """
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._sent: deque = deque()  # (monotonic time, tokens)
+        self._tokens = 0
+    
+    async def acquire(self, tokens: int):
+        """Wait until one more request of about this many tokens fits in the window."""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        
+        while True:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0][0] >= 60:
+                self._tokens -= self._sent.popleft()[1]
+            
+            if (not self.rpm or len(self._sent) < self.rpm) and (not self.tpm or self._tokens + tokens <= self.tpm):
+                self._sent.append((now, tokens))
+                self._tokens += tokens
+                return
+            
+            await asyncio.sleep(60 - (now - self._sent[0][0]) + 0.01)
+
+
+_LIMITERS: Dict[Tuple[int, int], _RateLimiter] = {}
+
+
+def _get_limiter(rpm: int, tpm: int) -> Optional[_RateLimiter]:
+    """Shared limiter for these limits, or None if both are unlimited."""
+    if not rpm and not tpm:
+        return None
+    key = (rpm, tpm)
+    if key not in _LIMITERS:
+        _LIMITERS[key] = _RateLimiter(rpm, tpm)
+    return _LIMITERS[key]
+
+
+_BOOTSTRAPPED = False
+
+
+def _bootstrap():
+    """Initialize colorama on first use rather than at import, so importing the module stays cheap."""
+    global _BOOTSTRAPPED
+    if not _BOOTSTRAPPED:
+        init(autoreset=True)
+        _BOOTSTRAPPED = True
+
+
+# Folders the batch tools may touch; BASE_DIR itself holds the code, .env and .git.
+# Approved/ is the human approval gate (its files get posted or executed), so the model
+# never gets to write there, and tasks can only be moved out of Needs_Action/.
+_VAULT_DIRS = tuple(d.resolve() for d in (NEEDS_ACTION_DIR, DONE_DIR, PENDING_DIR))
+_MOVE_DIRS = (NEEDS_ACTION_DIR.resolve(),)
+
+
+def _vault_path(path: str, allowed_dirs: Tuple[Path, ...] = _VAULT_DIRS) -> Path:
+    """Resolve a vault path like /Needs_Action/a.md, refusing anything outside allowed_dirs."""
+    resolved = (BASE_DIR / str(path).lstrip("/\\")).resolve()
+    for vault_dir in allowed_dirs:
+        if resolved != vault_dir and resolved.is_relative_to(vault_dir):
+            if any(part.startswith(".") for part in resolved.relative_to(vault_dir).parts):
+                raise ValueError(f"Hidden files are not accessible: {path}")
+            return resolved
+    raise ValueError(f"Path not allowed for this tool: {path}")
+
+
+def _tool_read_file(path: str) -> str:
+    return _vault_path(path).read_text(encoding="utf-8")
+
+
+def _tool_write_file(path: str, content: str) -> str:
+    target = _vault_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content, encoding="utf-8")
+    return f"Wrote {len(content)} characters"
+
+
+def _tool_move_to_done(path: str) -> str:
+    source = _vault_path(path, _MOVE_DIRS)
+    target = DONE_DIR / source.name
+    if target.exists():
+        raise FileExistsError(f"/Done/{source.name} already exists")
+    os.replace(source, target)
+    return f"Moved to /Done/{source.name}"
+
+
+_BATCH_TOOLS: Dict[str, Callable[..., str]] = {
+    "read_file": _tool_read_file,
+    "write_file": _tool_write_file,
+    "move_to_done": _tool_move_to_done,
+}
+
+
+def _parse_batch(response: str) -> Optional[List[Dict[str, Any]]]:
+    """Invocations from the response's <batch> block, or None if it has none."""
+    match = _BATCH_RE.search(response)
+    if not match:
+        return None
+    try:
+        invocations = _json_loads(match.group(1))["invocations"]
+    except (ValueError, KeyError, TypeError) as e:
+        return [{"tool_name": None, "error": f"Invalid batch block: {e}"}]
+    if not isinstance(invocations, list):
+        return [{"tool_name": None, "error": "invocations must be a list"}]
+    return invocations[:_BATCH_MAX_INVOCATIONS]
+
+
+def _run_invocation(invocation: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute one batch invocation, reporting failures in the result instead of raising."""
+    if not isinstance(invocation, dict):
+        return {"tool_name": None, "ok": False, "error": "Invocation must be an object"}
+    name = invocation.get("tool_name")
+    if "error" in invocation:
+        return {"tool_name": name, "ok": False, "error": invocation["error"]}
+    tool = _BATCH_TOOLS.get(name)
+    if tool is None:
+        return {"tool_name": name, "ok": False, "error": f"Unknown tool: {name}"}
+    try:
+        return {"tool_name": name, "ok": True, "result": tool(**(invocation.get("arguments") or {}))}
+    except Exception as e:
+        return {"tool_name": name, "ok": False, "error": str(e)}
+
+
+async def _run_batch(invocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Execute batch invocations concurrently; results keep the invocation order."""
+    return list(await asyncio.gather(*(asyncio.to_thread(_run_invocation, inv) for inv in invocations)))
+
+
+def _run_batch_sync(invocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """_run_batch for the sync loop, on worker threads so it works under a running event loop."""
+    with ThreadPoolExecutor(max_workers=min(len(invocations), 8), thread_name_prefix="ralph-batch") as pool:
+        return list(pool.map(_run_invocation, invocations))
+
+
+def _batch_results_prompt(results: List[Dict[str, Any]]) -> str:
+    """Next user message carrying the batch results back to the model."""
+    return f"Batch results:\n{_json_dumps(results).decode('utf-8')}\n\n{_CONTINUATION_PROMPT}"
 
 
 class RalphLoop:
@@ -65,7 +415,14 @@ class RalphLoop:
         task_description: str,
         completion_check_fn: Optional[Callable[[str], bool]] = None,
         max_iterations: int = 10,
-        delay_between_iterations: float = 1.0
+        delay_between_iterations: float = 1.0,
+        memory_window: Optional[int] = RALPH_MEMORY_WINDOW,
+        summarize_fn: Optional[Callable[[List[Dict[str, str]]], Optional[str]]] = None,
+        use_cache: bool = False,
+        rpm: int = RALPH_RPM,
+        tpm: int = RALPH_TPM,
+        batch_tools: bool = False,
+        loop_id: Optional[str] = None
     ):
         """
         Initialize Ralph Loop.
@@ -76,22 +433,55 @@ class RalphLoop:
                                 If None, defaults to checking for <TASK_COMPLETE> tag.
             max_iterations: Maximum number of iterations before giving up
             delay_between_iterations: Seconds to wait between iterations
+            memory_window: Iterations kept verbatim in the prompt; older ones are
+                           replaced by a summary. None or 0 keeps the full history.
+            summarize_fn: Function that takes the older messages and returns a summary.
+                          If None, Qwen is asked to summarize them.
+            use_cache: Reuse stored responses for identical requests (same model,
+                       temperature and messages) from the last 7 days. Only for tasks
+                       whose outcome doesn't depend on vault files; ignored with
+                       batch_tools, and a run that fails drops its entries.
+            rpm: Requests per minute allowed across concurrent async loops (0 = unlimited)
+            tpm: Estimated tokens per minute allowed across concurrent async loops (0 = unlimited)
+            batch_tools: Let the model read, write and move vault files through
+                         <batch> blocks, executed concurrently between iterations
+            loop_id: Tag in this loop's iteration log and failure alert filenames, so
+                     concurrent loops don't overwrite each other. Defaults to a short uuid.
         """
+        _bootstrap()
+        
         self.task = task_description
+        self.loop_id = loop_id or uuid.uuid4().hex[:8]
         self.max_iter = max_iterations
         self.delay = delay_between_iterations
         self.iteration = 0
         self.history: List[Dict[str, str]] = []
         self.responses: List[str] = []
+        self.memory_window = memory_window
+        self.summarize_fn = summarize_fn
+        self.summary: Optional[str] = None
+        # A replayed response would re-run its batch tool side effects
+        self.use_cache = use_cache and not batch_tools
+        self._cache_keys: List[str] = []
+        self.limiter = _get_limiter(rpm, tpm)
+        self.batch_tools = batch_tools
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         
         # Default completion check - look for the tag
         if completion_check_fn is None:
-            self.check_complete = lambda r: "<TASK_COMPLETE>" in r
+            self.check_complete = contains_phrase(_COMPLETE_TAG)
         else:
             self.check_complete = completion_check_fn
         
+        # Request headers are the same for every call
+        self.headers = {
+            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/ralph-loop",
+            "X-Title": "Ralph Loop Agent"
+        }
+        
         # System prompt for autonomous worker behavior
         self.system_prompt = """You are an autonomous AI worker. Your job is to complete tasks fully and thoroughly.
 
@@ -104,16 +494,20 @@ IMPORTANT RULES:
 6. If you need more information or hit a blocker, state it clearly
 
 Remember: Quality over speed. Complete the task properly before marking it done."""
+        if batch_tools:
+            self.system_prompt += _BATCH_TOOL_PROMPT
+        self._prefix_messages = self._build_prefix()
     
     def _log(self, message: str, level: str = "INFO"):
         """Log message to console and file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
         log_entry = f"[{timestamp}] [RALPH] [{level}] {message}\n"
         
         # Write to log file
-        log_file = LOGS_DIR / "ralph_loop.log"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        with _LOG_LOCK:
+            _LOG_FH.write(log_entry)
+            if level in _FLUSH_LEVELS:
+                _LOG_FH.flush()
         
         # Print to console with colors
         if level == "ERROR":
@@ -137,37 +531,48 @@ Remember: Quality over speed. Complete the task properly before marking it done.
         Returns:
             Response content string, or None if failed
         """
+        payload = self._build_payload(messages)
+        cache_key = _response_cache_key(payload) if self.use_cache else None
+        if cache_key:
+            self._cache_keys.append(cache_key)
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                self._log("Cache hit - reusing stored response", "INFO")
+                return cached
+        
         try:
             if not OPENROUTER_API_KEY:
                 self._log("OPENROUTER_API_KEY not set. Cannot call Qwen.", "ERROR")
                 return None
             
-            headers = {
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/ralph-loop",
-                "X-Title": "Ralph Loop Agent"
-            }
-            
-            payload = {
-                "model": OPENROUTER_MODEL,
-                "messages": messages,
-                "max_tokens": RALPH_MAX_TOKENS,
-                "temperature": RALPH_TEMPERATURE
-            }
-            
-            response = requests.post(
+            response = _SESSION.post(
                 f"{OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=120  # Longer timeout for complex tasks
+                headers=self.headers,
+                data=_json_dumps({**payload, "stream": True}),
+                timeout=120,  # Longer timeout for complex tasks
+                stream=True
             )
-            response.raise_for_status()
+            try:
+                response.raise_for_status()
+                
+                collector = _StreamCollector()
+                # SSE is UTF-8, but requests would guess ISO-8859-1 for a charset-less
+                # text/event-stream; decode each raw line ourselves
+                for line in response.iter_lines():
+                    delta = _sse_delta(line.decode("utf-8") if line else "")
+                    if delta is None:
+                        break
+                    if delta and collector.add(delta):
+                        self._log("Completion tag received - closing stream early", "INFO")
+                        break
+            finally:
+                response.close()
             
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            content = collector.text()
             
-            return content.strip()
+            if cache_key and content:
+                _cache_put(cache_key, content)
+            return content
             
         except requests.exceptions.Timeout:
             self._log("Qwen API request timed out", "ERROR")
@@ -179,29 +584,183 @@ Remember: Quality over speed. Complete the task properly before marking it done.
             self._log(f"Error calling Qwen: {str(e)}", "ERROR")
             return None
     
+    async def _call_qwen_async(self, client, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Async variant of _call_qwen.
+        
+        Args:
+            client: Shared httpx.AsyncClient, or None to run _call_qwen in a worker thread
+            messages: List of message dicts with 'role' and 'content'
+        
+        Returns:
+            Response content string, or None if failed
+        """
+        if client is None:
+            if self.limiter:
+                await self.limiter.acquire(self._estimate_tokens(messages))
+            return await asyncio.to_thread(self._call_qwen, messages)
+        
+        payload = self._build_payload(messages)
+        cache_key = _response_cache_key(payload) if self.use_cache else None
+        if cache_key:
+            self._cache_keys.append(cache_key)
+            cached = await asyncio.to_thread(_cache_get, cache_key)
+            if cached is not None:
+                self._log("Cache hit - reusing stored response", "INFO")
+                return cached
+        
+        if self.limiter:
+            await self.limiter.acquire(self._estimate_tokens(messages))
+        
+        try:
+            if not OPENROUTER_API_KEY:
+                self._log("OPENROUTER_API_KEY not set. Cannot call Qwen.", "ERROR")
+                return None
+            
+            collector = _StreamCollector()
+            async with client.stream(
+                "POST",
+                f"{OPENROUTER_BASE_URL}/chat/completions",
+                headers=self.headers,
+                content=_json_dumps({**payload, "stream": True}),
+                timeout=httpx.Timeout(120)
+            ) as response:
+                response.raise_for_status()
+                
+                # Leaving the block early closes the connection and stops generation
+                async for line in response.aiter_lines():
+                    delta = _sse_delta(line)
+                    if delta is None:
+                        break
+                    if delta and collector.add(delta):
+                        self._log("Completion tag received - closing stream early", "INFO")
+                        break
+            
+            content = collector.text()
+            
+            if cache_key and content:
+                await asyncio.to_thread(_cache_put, cache_key, content)
+            return content
+            
+        except httpx.TimeoutException:
+            self._log("Qwen API request timed out", "ERROR")
+            return None
+        except httpx.HTTPError as e:
+            self._log(f"Qwen API request failed: {str(e)}", "ERROR")
+            return None
+        except Exception as e:
+            self._log(f"Error calling Qwen: {str(e)}", "ERROR")
+            return None
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Rough request size for rate limiting: ~4 characters per prompt token plus the completion budget."""
+        return len(_json_dumps(messages)) // 4 + RALPH_MAX_TOKENS
+    
+    def _build_payload(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build the chat completion request body."""
+        return {
+            "model": OPENROUTER_MODEL,
+            "messages": messages,
+            "max_tokens": RALPH_MAX_TOKENS,
+            "temperature": RALPH_TEMPERATURE
+        }
+    
+    def _build_prefix(self) -> Tuple[Dict[str, Any], ...]:
+        """Build the system + task messages that open every request, identical across iterations."""
+        task_prompt = f"TASK: {self.task}\n\nBegin working on this task now."
+        if _PROMPT_CACHE_CONTROL:
+            # Cache breakpoint after the static system + task prefix
+            task_prompt = [{"type": "text", "text": task_prompt, "cache_control": {"type": "ephemeral"}}]
+        
+        return (
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": task_prompt}
+        )
+    
     def _build_messages(self) -> List[Dict[str, str]]:
         """Build the messages list for Qwen API call."""
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"TASK: {self.task}\n\nBegin working on this task now."}
-        ]
+        messages = list(self._prefix_messages)
+        
+        # Summary of iterations that fell out of the memory window
+        if self.summary:
+            messages.append({"role": "system", "content": self.summary})
         
         # Add conversation history
-        for msg in self.history:
-            messages.append(msg)
+        messages.extend(self.history)
+        
+        # The remaining-iterations note only goes on the final history message, so
+        # earlier messages (and the cached task prefix) never change between iterations
+        completed = self.iteration - 1
+        if completed > 1 and self.history and messages[-1]["role"] == "user":
+            messages[-1] = {
+                "role": "user",
+                "content": f"{messages[-1]['content']} You have {self.max_iter - completed} iteration(s) remaining."
+            }
         
         return messages
     
+    def _history_to_summarize(self) -> Optional[List[Dict[str, str]]]:
+        """Messages older than the memory window, led by the previous summary, or None."""
+        if not self.memory_window:
+            return None
+        keep = 2 * self.memory_window
+        if len(self.history) <= keep:
+            return None
+        
+        older = self.history[:-keep]
+        if self.summary:
+            older = [{"role": "system", "content": self.summary}] + older
+        return older
+    
+    def _summary_messages(self, older: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the messages asking Qwen to summarize older iterations."""
+        transcript = "\n\n".join(f"[{msg['role'].upper()}]\n{msg['content']}" for msg in older)
+        return [
+            {"role": "system", "content": "You summarize an autonomous AI worker's progress on a task."},
+            {"role": "user", "content": f"TASK: {self.task}\n\n{transcript}\n\n{_SUMMARY_PROMPT}"}
+        ]
+    
+    def _apply_summary(self, summary: Optional[str]):
+        """Replace iterations outside the memory window with their summary."""
+        if not summary:
+            self._log("History summarization failed; keeping full history", "WARNING")
+            return
+        self.summary = f"Progress so far (earlier iterations, summarized):\n{summary}"
+        self.history = self.history[-2 * self.memory_window:]
+        self._log("Summarized earlier iterations to keep the prompt short", "INFO")
+    
+    def _compact_history(self):
+        """Summarize iterations older than the memory window."""
+        older = self._history_to_summarize()
+        if older is None:
+            return
+        if self.summarize_fn:
+            summary = self.summarize_fn(older)
+        else:
+            summary = self._call_qwen(self._summary_messages(older))
+        self._apply_summary(summary)
+    
+    async def _compact_history_async(self, client):
+        """Async variant of _compact_history."""
+        older = self._history_to_summarize()
+        if older is None:
+            return
+        if self.summarize_fn:
+            summary = await asyncio.to_thread(self.summarize_fn, older)
+        else:
+            summary = await self._call_qwen_async(client, self._summary_messages(older))
+        self._apply_summary(summary)
+    
     def _save_iteration_log(self, iteration: int, response: str, is_complete: bool):
         """Save detailed iteration log."""
-        log_file = LOGS_DIR / f"ralph_iteration_{iteration:03d}.md"
+        log_file = LOGS_DIR / f"ralph_{self.loop_id}_iteration_{iteration:03d}.md"
         
         # Create summary of response (first 500 chars)
         response_summary = response[:500] + "..." if len(response) > 500 else response
         
         content = f"""# Ralph Loop - Iteration {iteration}
 
-**Timestamp:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+**Timestamp:** {time.strftime(_TIMESTAMP_FORMAT)}
 **Task:** {self.task}
 **Complete:** {is_complete}
 
@@ -220,9 +779,17 @@ Remember: Quality over speed. Complete the task properly before marking it done.
         with open(log_file, "w", encoding="utf-8") as f:
             f.write(content)
     
+    def _save_iteration_log_safe(self, iteration: int, response: str, is_complete: bool):
+        """_save_iteration_log for the background writer; failures are logged instead of lost."""
+        try:
+            self._save_iteration_log(iteration, response, is_complete)
+        except Exception as e:
+            self._log(f"Failed to save iteration {iteration} log: {str(e)}", "ERROR")
+    
     def _create_failure_alert(self):
         """Create alert file when max iterations reached without completion."""
-        alert_file = NEEDS_ACTION_DIR / f"RALPH_FAILED_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        now = time.localtime()
+        alert_file = NEEDS_ACTION_DIR / f"{_FAILURE_ALERT_PREFIX}{time.strftime('%Y%m%d_%H%M%S', now)}_{self.loop_id}.md"
         
         # Create task summary from history
         task_summary = "\n\n".join([
@@ -235,7 +802,7 @@ type: ralph_failure
 task: {self.task}
 iterations_used: {self.iteration}
 max_iterations: {self.max_iter}
-failed_at: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+failed_at: {time.strftime(_TIMESTAMP_FORMAT, now)}
 status: needs_human_intervention
 ---
 # Ralph Loop Failed to Complete Task
@@ -272,15 +839,8 @@ Please review the logs in /Logs/ and either:
         self._log(f"Failure alert created: {alert_file.name}", "WARNING")
         return alert_file
     
-    def run(self) -> Dict[str, Any]:
-        """
-        Execute the Ralph Loop until completion or max iterations.
-        
-        Returns:
-            Dict with: success, iterations_used, final_response, history
-        """
-        import requests  # Import here to avoid circular dependency issues
-        
+    def _start(self):
+        """Reset loop state before a run."""
         self._log(f"Starting Ralph Loop for task: {self.task[:100]}...", "INFO")
         self._log(f"Max iterations: {self.max_iter}", "INFO")
         
@@ -288,7 +848,115 @@ Please review the logs in /Logs/ and either:
         self.iteration = 0
         self.history = []
         self.responses = []
+        self.summary = None
+        # Only this run's cached responses are dropped if it fails
+        self._cache_keys = []
+        self._prefix_messages = self._build_prefix()
+        # Iteration logs are written in the background while the next API call runs
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ralph-io")
+    
+    def _handle_response(self, response: str, batch_results: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Record an iteration's response.
+        
+        Args:
+            response: The model's response text
+            batch_results: Results of the response's batch block, if it had one
+        
+        Returns:
+            The success result if the task is complete, otherwise None after
+            queuing the continuation prompt.
+        """
+        # Save response
+        self.responses.append(response)
+        self._io_pool.submit(self._save_iteration_log_safe, self.iteration, response, False)
+        
+        # Log response summary
+        response_preview = response[:200].replace("\n", " ") + "..." if len(response) > 200 else response.replace("\n", " ")
+        self._log(f"Response: {response_preview}", "INFO")
+        
+        # Check for completion
+        is_complete = self.check_complete(response)
+        
+        if is_complete:
+            self.end_time = datetime.now()
+            self._log(f"Task completed in {self.iteration} iteration(s)!", "SUCCESS")
+            
+            # Final log
+            duration = (self.end_time - self.start_time).total_seconds()
+            self._log(f"Total duration: {duration:.1f} seconds", "INFO")
+            
+            return {
+                "success": True,
+                "iterations_used": self.iteration,
+                "final_response": response,
+                "history": tuple(self.history),
+                "all_responses": tuple(self.responses),
+                "duration_seconds": duration,
+                "task": self.task
+            }
+        
+        # Not complete - add to history and continue
+        self.history.append({"role": "assistant", "content": response})
+        
+        # Add continuation prompt, carrying any batch results
+        if batch_results is not None:
+            self.history.append({"role": "user", "content": _batch_results_prompt(batch_results)})
+        else:
+            self.history.append({"role": "user", "content": _CONTINUATION_PROMPT})
+        return None
+    
+    def _batch_invocations(self, response: str) -> Optional[List[Dict[str, Any]]]:
+        """Batch invocations requested by the response, if batch tools are enabled."""
+        if not self.batch_tools:
+            return None
+        invocations = _parse_batch(response)
+        if invocations:
+            self._log(f"Running {len(invocations)} batch invocation(s)", "INFO")
+        return invocations
+    
+    def _finish_failed(self) -> Dict[str, Any]:
+        """Build the failure result once max iterations are used up."""
+        self.end_time = datetime.now()
+        self._log(f"Max iterations ({self.max_iter}) reached without completion", "ERROR")
+        
+        # Create failure alert
+        self._create_failure_alert()
+        
+        # Don't let a rerun replay the responses that led here
+        if self._cache_keys:
+            _cache_delete(self._cache_keys)
         
+        duration = (self.end_time - self.start_time).total_seconds()
+        
+        return {
+            "success": False,
+            "iterations_used": self.iteration,
+            "final_response": self.responses[-1] if self.responses else None,
+            "history": tuple(self.history),
+            "all_responses": tuple(self.responses),
+            "duration_seconds": duration,
+            "task": self.task,
+            "failure_reason": "max_iterations_reached"
+        }
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute the Ralph Loop until completion or max iterations.
+        
+        Returns:
+            Dict with: success, iterations_used, final_response, history and
+                       all_responses (read-only tuples)
+        """
+        self._start()
+        try:
+            return self._iterate()
+        finally:
+            # Make sure every queued iteration log is on disk before returning
+            self._io_pool.shutdown(wait=True)
+    
+    def _iterate(self) -> Dict[str, Any]:
+        """Iteration loop behind run()."""
         while self.iteration < self.max_iter:
             self.iteration += 1
             self._log(f"=== Iteration {self.iteration}/{self.max_iter} ===", "ITERATION")
@@ -305,77 +973,131 @@ Please review the logs in /Logs/ and either:
                 time.sleep(self.delay)
                 continue
             
-            # Save response
-            self.responses.append(response)
-            self._save_iteration_log(self.iteration, response, False)
+            # Run requested file operations before the completion check sees their effects
+            invocations = self._batch_invocations(response)
+            batch_results = _run_batch_sync(invocations) if invocations else None
             
-            # Log response summary
-            response_preview = response[:200].replace("\n", " ") + "..." if len(response) > 200 else response.replace("\n", " ")
-            self._log(f"Response: {response_preview}", "INFO")
+            result = self._handle_response(response, batch_results)
+            if result:
+                return result
             
-            # Check for completion
-            is_complete = self.check_complete(response)
+            if self.iteration < self.max_iter:
+                self._compact_history()
             
-            if is_complete:
-                self.end_time = datetime.now()
-                self._log(f"Task completed in {self.iteration} iteration(s)!", "SUCCESS")
-                
-                # Final log
-                duration = (self.end_time - self.start_time).total_seconds()
-                self._log(f"Total duration: {duration:.1f} seconds", "INFO")
-                
-                return {
-                    "success": True,
-                    "iterations_used": self.iteration,
-                    "final_response": response,
-                    "history": self.history.copy(),
-                    "all_responses": self.responses.copy(),
-                    "duration_seconds": duration,
-                    "task": self.task
-                }
+            # Delay before next iteration
+            if self.iteration < self.max_iter:
+                self._log(f"Waiting {self.delay}s before next iteration...", "INFO")
+                time.sleep(self.delay)
+        
+        # Max iterations reached without completion
+        return self._finish_failed()
+    
+    async def run_async(self, client=None) -> Dict[str, Any]:
+        """
+        Async variant of run, so many loops can wait on the API at once.
+        
+        Args:
+            client: Shared httpx.AsyncClient; one is created for this run if
+                    omitted and httpx is installed
+        
+        Returns:
+            Dict with: success, iterations_used, final_response, history
+        """
+        if client is None and HTTPX_AVAILABLE:
+            async with _async_client() as own_client:
+                return await self.run_async(own_client)
+        
+        self._start()
+        try:
+            return await self._iterate_async(client)
+        finally:
+            await asyncio.to_thread(self._io_pool.shutdown, wait=True)
+    
+    async def _iterate_async(self, client) -> Dict[str, Any]:
+        """Iteration loop behind run_async()."""
+        while self.iteration < self.max_iter:
+            self.iteration += 1
+            self._log(f"=== Iteration {self.iteration}/{self.max_iter} ===", "ITERATION")
+            
+            messages = self._build_messages()
             
-            # Not complete - add to history and continue
-            self.history.append({"role": "assistant", "content": response})
+            self._log("Calling Qwen...", "INFO")
+            response = await self._call_qwen_async(client, messages)
             
-            # Add continuation prompt
-            continuation_prompt = "Continue working on the task. You have not finished yet. "
-            if self.iteration > 1:
-                continuation_prompt += f"You have {self.max_iter - self.iteration} iteration(s) remaining. "
-            continuation_prompt += "Review your previous work above and keep making progress. "
-            continuation_prompt += "When the task is 100% complete, end with <TASK_COMPLETE>."
+            if response is None:
+                self._log("Qwen call failed. Retrying...", "WARNING")
+                await asyncio.sleep(self.delay)
+                continue
             
-            self.history.append({"role": "user", "content": continuation_prompt})
+            invocations = self._batch_invocations(response)
+            batch_results = await _run_batch(invocations) if invocations else None
+            
+            result = self._handle_response(response, batch_results)
+            if result:
+                return result
             
-            # Delay before next iteration
             if self.iteration < self.max_iter:
+                await self._compact_history_async(client)
                 self._log(f"Waiting {self.delay}s before next iteration...", "INFO")
-                time.sleep(self.delay)
+                await asyncio.sleep(self.delay)
         
-        # Max iterations reached without completion
-        self.end_time = datetime.now()
-        self._log(f"Max iterations ({self.max_iter}) reached without completion", "ERROR")
+        return self._finish_failed()
+    
+    @classmethod
+    async def run_many(cls, loops: List["RalphLoop"], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run several loops concurrently over one shared connection pool.
         
-        # Create failure alert
-        self._create_failure_alert()
+        Args:
+            loops: RalphLoop instances to run
+            max_concurrency: Most loops running at once (None for no limit)
         
-        duration = (self.end_time - self.start_time).total_seconds()
+        Returns:
+            Result dicts in the same order as loops
+        """
+        sem = asyncio.Semaphore(max_concurrency) if max_concurrency else None
         
-        return {
-            "success": False,
-            "iterations_used": self.iteration,
-            "final_response": self.responses[-1] if self.responses else None,
-            "history": self.history.copy(),
-            "all_responses": self.responses.copy(),
-            "duration_seconds": duration,
-            "task": self.task,
-            "failure_reason": "max_iterations_reached"
-        }
+        async def run_one(loop: "RalphLoop", client) -> Dict[str, Any]:
+            if sem is None:
+                return await loop.run_async(client)
+            async with sem:
+                return await loop.run_async(client)
+        
+        if not HTTPX_AVAILABLE:
+            return list(await asyncio.gather(*(run_one(loop, None) for loop in loops)))
+        
+        async with _async_client() as client:
+            return list(await asyncio.gather(*(run_one(loop, client) for loop in loops)))
+
+
+def _async_client():
+    """Create the pooled httpx client shared by concurrent Ralph loops."""
+    # Limits go on the transport: a custom transport ignores the client's own limits
+    return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(
+        retries=3,
+        limits=httpx.Limits(
+            max_connections=_ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=_ASYNC_MAX_KEEPALIVE
+        )
+    ))
 
 
 # ============================================================================
 # BUILT-IN COMPLETION CHECKERS
 # ============================================================================
 
+def _has_visible_files(path: Path) -> bool:
+    """True if the directory holds at least one non-hidden file; stops at the first one found."""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.name.startswith(".") and entry.is_file():
+                    return True
+    except FileNotFoundError:
+        return False
+    return False
+
+
 def file_moved_to_done(filename: str) -> Callable[[str], bool]:
     """
     Returns a completion checker that verifies if a file exists in /Done/.
@@ -412,7 +1134,9 @@ def contains_phrase(phrase: str) -> Callable[[str], bool]:
         ralph = RalphLoop(task, completion_check_fn=checker)
     """
     def check(response: str) -> bool:
-        return phrase in response
+        # The phrase usually closes the response (streams stop right after the tag),
+        # so try the O(len(phrase)) suffix check before scanning the whole text
+        return response.endswith(phrase) or phrase in response
     return check
 
 
@@ -425,10 +1149,7 @@ def all_files_processed() -> Callable[[str], bool]:
         ralph = RalphLoop("Process all files", completion_check_fn=checker)
     """
     def check(response: str) -> bool:
-        if not NEEDS_ACTION_DIR.exists():
-            return True
-        files = [f for f in NEEDS_ACTION_DIR.iterdir() if f.is_file() and not f.name.startswith(".")]
-        return len(files) == 0
+        return not _has_visible_files(NEEDS_ACTION_DIR)
     return check
 
 
@@ -442,10 +1163,7 @@ def directory_empty(dirpath: Union[str, Path]) -> Callable[[str], bool]:
     """
     path = Path(dirpath)
     def check(response: str) -> bool:
-        if not path.exists():
-            return True
-        files = [f for f in path.iterdir() if f.is_file() and not f.name.startswith(".")]
-        return len(files) == 0
+        return not _has_visible_files(path)
     return check
 
 
@@ -463,12 +1181,10 @@ def compound_check(*checkers: Callable[[str], bool], require_all: bool = True) -
             contains_phrase("TASK_COMPLETE")
         )
     """
+    # Short-circuits: later checkers (often filesystem scans) only run when they can change the outcome
+    reducer = all if require_all else any
     def check(response: str) -> bool:
-        results = [checker(response) for checker in checkers]
-        if require_all:
-            return all(results)
-        else:
-            return any(results)
+        return reducer(checker(response) for checker in checkers)
     return check
 
 
@@ -476,27 +1192,76 @@ def compound_check(*checkers: Callable[[str], bool], require_all: bool = True) -
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
-def process_needs_action(max_iterations: int = 10) -> Dict[str, Any]:
+def process_needs_action(max_iterations: int = 10, max_concurrency: int = RALPH_CONCURRENCY) -> Dict[str, Any]:
     """
     Process all files in /Needs_Action/ directory.
     
     Usage:
         result = process_needs_action()
     """
-    task = (
-        "Process all files in /Needs_Action/ directory. "
-        "For each file: 1) Read and understand the task, 2) Create a plan, "
-        "3) Execute the plan, 4) Move the file to /Done/ when complete. "
-        "Process ALL files in the directory."
-    )
+    return asyncio.run(process_needs_action_async(max_iterations, max_concurrency))
+
+
+async def process_needs_action_async(max_iterations: int = 10, max_concurrency: int = RALPH_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Process every file in /Needs_Action/ with its own Ralph Loop, several at once.
+    Earlier RALPH_FAILED_* alerts are left for a human rather than retried.
     
-    ralph = RalphLoop(
-        task_description=task,
-        completion_check_fn=all_files_processed(),
-        max_iterations=max_iterations
-    )
+    Args:
+        max_iterations: Max iterations for each file's loop
+        max_concurrency: Most files being worked on at the same time
     
-    return ralph.run()
+    Returns:
+        Dict with: success (every file reached /Done/), iterations_used (total),
+        files, results (per-file result dicts keyed by filename), duration_seconds
+    
+    Usage:
+        result = asyncio.run(process_needs_action_async(max_concurrency=4))
+    """
+    start = time.monotonic()
+    with os.scandir(NEEDS_ACTION_DIR) as entries:
+        files = sorted(
+            e.name for e in entries
+            if not e.name.startswith((".", _FAILURE_ALERT_PREFIX)) and e.is_file()
+        )
+    
+    loops = [
+        RalphLoop(
+            task_description=(
+                f"Process the file /Needs_Action/{name}. "
+                "1) Read and understand the task, 2) Create a plan, "
+                "3) Execute the plan, 4) Move the file to /Done/ when complete."
+            ),
+            completion_check_fn=file_moved_to_done(name),
+            max_iterations=max_iterations,
+            batch_tools=True,
+            loop_id=name
+        )
+        for name in files
+    ]
+    results = await RalphLoop.run_many(loops, max_concurrency=max_concurrency)
+    
+    return {
+        "success": all(result["success"] for result in results),
+        "iterations_used": sum(result["iterations_used"] for result in results),
+        "files": files,
+        "results": dict(zip(files, results)),
+        "duration_seconds": time.monotonic() - start
+    }
+
+
+async def run_batch_async(tasks: List[str], **kwargs) -> List[Dict[str, Any]]:
+    """
+    Run one Ralph Loop per task concurrently.
+    
+    Args:
+        tasks: Task descriptions
+        **kwargs: Passed to each RalphLoop (completion_check_fn, max_iterations, ...)
+    
+    Usage:
+        results = asyncio.run(run_batch_async(["Task A", "Task B"]))
+    """
+    return await RalphLoop.run_many([RalphLoop(task_description=task, **kwargs) for task in tasks])
 
 
 def generate_report(report_type: str, max_iterations: int = 5) -> Dict[str, Any]:
@@ -534,6 +1299,8 @@ def generate_report(report_type: str, max_iterations: int = 5) -> Dict[str, Any]
 # ============================================================================
 
 if __name__ == "__main__":
+    _bootstrap()
+    
     print(f"{Fore.CYAN}=== Ralph Loop - Autonomous AI Worker ===")
     print(f"Model: {OPENROUTER_MODEL}")
     print(f"API Key configured: {'Yes' if OPENROUTER_API_KEY else 'No'}")
@@ -4,6 +4,9 @@ Master Scheduler Service
 Runs all Silver Tier components on schedule.
 """
 
+import asyncio
+import atexit
+import functools
 import json
 import os
 import re
@@ -13,12 +16,22 @@ import time
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Tuple, Union
 
-import schedule
 from colorama import init, Fore, Style
 from dotenv import load_dotenv
-from openai import OpenAI
+
+# openai is imported when the AI client is first created, so --help and
+# runs without an API key skip its start-up cost
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Optional: watchfiles for event-driven folder checks (falls back to polling)
+try:
+    from watchfiles import awatch, Change
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
 
 # Initialize colorama
 init(autoreset=True)
@@ -37,12 +50,15 @@ class Config:
     INBOX_DIR = VAULT_DIR / "Inbox"
     NEEDS_ACTION_DIR = VAULT_DIR / "Needs_Action"
     DONE_DIR = VAULT_DIR / "Done"
+    APPROVED_DIR = VAULT_DIR / "Approved"
+    REJECTED_DIR = VAULT_DIR / "Rejected"
     BRIEFINGS_DIR = VAULT_DIR / "Briefings"
     LOGS_DIR = VAULT_DIR / "Logs"
     
     # Files
     DASHBOARD_FILE = VAULT_DIR / "Dashboard.md"
     BUSINESS_GOALS_FILE = VAULT_DIR / "Business_Goals.md"
+    TYPE_CACHE_FILE = VAULT_DIR / ".type_cache.json"  # path -> (mtime, frontmatter type)
     
     # AI Settings
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
@@ -53,17 +69,240 @@ class Config:
     QWEN_BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
     QWEN_MODEL = "qwen-plus"
     
+    # Concurrent AI requests and retry policy (exponential backoff from AI_RETRY_DELAY)
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "5"))
+    OPENAI_RPM = int(os.getenv("OPENAI_RPM", "60"))  # Chat requests per minute (0 = unlimited)
+    AI_MAX_RETRIES = 6
+    AI_RETRY_DELAY = 10  # seconds
+    
+    # Done files read at once while counting briefing statistics
+    FILE_READ_CONCURRENCY = 32
+    
+    # Batch API for briefings: half-price tokens, results within 24 hours.
+    # Needs a provider with the OpenAI Batch API (DashScope has it, OpenRouter does not)
+    BATCH_BRIEFINGS = os.getenv("BATCH_BRIEFINGS", "").lower() in ("1", "true", "yes")
+    BATCH_COLLECT_WINDOW = 5  # seconds to gather prompts from jobs firing together
+    BATCH_POLL_INTERVAL = 600  # 10 minutes
+    
     # Polling intervals (seconds)
     NEEDS_ACTION_INTERVAL = 30
     APPROVAL_INTERVAL = 15
     LINKEDIN_INTERVAL = 600  # 10 minutes
+    HOUSEKEEPING_INTERVAL = 600  # Safety-net rescan when a folder watcher is active (e.g. for NFS)
+    APPROVAL_DEBOUNCE = 0.5  # Seconds to wait for a burst of approvals to settle before scanning
+
+
+# Longest single sleep while waiting for a job; waits are re-checked against the
+# wall clock so suspend/resume or clock changes can't push a job far off schedule
+_MAX_SLEEP = 3600
+
+
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)  # O_BINARY: no newline translation on Windows
+
+# Frontmatter type field, matched on the raw bytes so the header needs no decoding
+_TYPE_RE = re.compile(rb'type:\s*(\w+)')
+
+
+def _read_frontmatter(path: Path, limit: int = 2048) -> bytes:
+    """
+    Read just the YAML frontmatter at the top of a Markdown file.
+    
+    Args:
+        path: Markdown file
+        limit: Most bytes to read
+    
+    Returns:
+        The bytes up to the closing '---' (or the first limit bytes without one)
+    """
+    # Bare open/read/close: no buffered file object, and none of the extra
+    # fstat/ioctl/lseek calls open() makes, per file in large Done scans
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        head = os.read(fd, limit)
+    finally:
+        os.close(fd)
+    if head.startswith(b"---"):
+        end = head.find(b"\n---", 3)
+        if end != -1:
+            head = head[:end]
+    return head
+
+
+def _daily_at(at: str) -> Callable[[datetime], datetime]:
+    """Next-run function for a job that fires every day at HH:MM."""
+    hour, minute = map(int, at.split(":"))
+    def next_run(now: datetime) -> datetime:
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return target if target > now else target + timedelta(days=1)
+    return next_run
+
+
+def _weekly_at(weekday: int, at: str) -> Callable[[datetime], datetime]:
+    """Next-run function for a job that fires weekly (weekday 0=Monday) at HH:MM."""
+    daily = _daily_at(at)
+    def next_run(now: datetime) -> datetime:
+        target = daily(now)
+        return target + timedelta(days=(weekday - target.weekday()) % 7)
+    return next_run
+
+
+def _every(seconds: float) -> float:
+    """Interval schedule for a job that fires every N seconds; rejects intervals that would spin."""
+    if seconds <= 0:
+        raise ValueError(f"Interval must be a positive number of seconds, got {seconds}")
+    return seconds
+
+
+class _RequestLimiter:
+    """
+    Token bucket allowing `rate` requests per `period` seconds, shared by
+    every briefing job so bursts wait for capacity instead of hitting 429s.
+    """
+    
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        # Created on first use: before Python 3.10 an asyncio.Lock binds to the loop
+        # current at construction, and the limiter is built before asyncio.run starts
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def acquire(self):
+        """Wait for one request's worth of capacity."""
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+
+# Statistics section of a saved briefing, filled from the _count_by_type stats
+_STATS_TEMPLATE = """## Statistics
+- Total tasks: {total}
+- LinkedIn posts: {linkedin_post}
+- Emails: {email}
+- Files: {file_drop}
+- WhatsApp: {whatsapp_message}
+- Payments: {payment}
+
+---
+
+"""
+
+_BRIEFING_FOOTER = """
+
+---
+*Generated automatically by AI Employee Scheduler*
+"""
+
+
+_BATCH_FINAL_STATES = frozenset(["completed", "failed", "expired", "cancelled"])
+
+
+class BatchBriefingQueue:
+    """
+    Collects briefing prompts issued close together and submits them as one
+    Batch API job; each caller awaits its own result.
+    """
+    
+    def __init__(self, client: "AsyncOpenAI"):
+        self.client = client
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def complete(self, request_id: str, body: Dict[str, Any]) -> str:
+        """Queue a chat completion request body and wait for its batched result."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((f"{request_id}-{len(self._pending)}", body, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+    
+    async def _flush_later(self):
+        """Submit everything queued during the collection window and hand out the results."""
+        await asyncio.sleep(Config.BATCH_COLLECT_WINDOW)
+        pending, self._pending, self._flush_task = self._pending, [], None
+        
+        try:
+            results = await self._run_batch([(custom_id, body) for custom_id, body, _ in pending])
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for custom_id, _, future in pending:
+            if future.done():
+                continue
+            if custom_id in results:
+                future.set_result(results[custom_id])
+            else:
+                future.set_exception(RuntimeError(f"No batch result for {custom_id}"))
+    
+    async def _run_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, str]:
+        """Upload the requests as JSONL, poll the batch until it finishes, and parse the output."""
+        lines = [
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests
+        ]
+        batch_file = await self.client.files.create(
+            file=("briefings.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"{Fore.CYAN}[BATCH]{Style.RESET_ALL} Submitted {len(requests)} briefing request(s) as batch {batch.id}")
+        
+        while batch.status not in _BATCH_FINAL_STATES:
+            await asyncio.sleep(Config.BATCH_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            choices = ((item.get("response") or {}).get("body") or {}).get("choices")
+            if choices:
+                results[item["custom_id"]] = choices[0]["message"]["content"].strip()
+        
+        print(f"{Fore.GREEN}[BATCH]{Style.RESET_ALL} Batch {batch.id} completed with {len(results)} result(s)")
+        return results
 
 
 class AIBriefingGenerator:
     """Generates briefings using AI."""
     
     def __init__(self):
-        self.client: Optional[OpenAI] = None
+        self.client: Optional["AsyncOpenAI"] = None
+        # Shared by every briefing job so overlapping jobs stay within AI_MAX_CONCURRENCY requests;
+        # created inside the running loop by _semaphore(), one per asyncio.run
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._limiter = _RequestLimiter(Config.OPENAI_RPM) if Config.OPENAI_RPM > 0 else None
+        self.batch_queue: Optional[BatchBriefingQueue] = None
+        # Frontmatter types of Done files keyed by path, valid while the mtime matches
+        self._type_cache: Dict[str, Tuple[float, Optional[str]]] = self._load_type_cache()
+        self._type_cache_dirty = False
+        atexit.register(self._save_type_cache)
+        self._goals_cache: Optional[Tuple[float, str]] = None
         self._init_client()
     
     def _init_client(self):
@@ -73,13 +312,48 @@ class AIBriefingGenerator:
         model = Config.QWEN_MODEL if Config.QWEN_API_KEY else Config.OPENROUTER_MODEL
         
         if api_key:
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            from openai import AsyncOpenAI
+            # _chat does its own backoff, so the SDK's retries are off for chat calls;
+            # the Batch API calls have no retry loop of their own and keep the SDK default
+            self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
             print(f"{Fore.GREEN}[AI]{Style.RESET_ALL} Briefing generator initialized ({model}).")
+            if Config.BATCH_BRIEFINGS:
+                self.batch_queue = BatchBriefingQueue(self.client.with_options(max_retries=2))
+                print(f"{Fore.GREEN}[AI]{Style.RESET_ALL} Briefings will be submitted through the Batch API.")
         else:
             print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} No AI API key. Briefings will be basic.")
             self.client = None
     
-    def generate_daily_briefing(self) -> Optional[Path]:
+    def _semaphore(self) -> asyncio.Semaphore:
+        """The request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(Config.AI_MAX_CONCURRENCY)
+            self._sem_loop = loop
+        return self._sem
+    
+    async def _chat(self, request_id: str, **kwargs) -> str:
+        """Run a chat completion, retrying transient failures with exponential backoff."""
+        if self.batch_queue is not None:
+            return await self.batch_queue.complete(request_id, kwargs)
+        
+        from openai import APIConnectionError, RateLimitError, InternalServerError
+        
+        for attempt in range(Config.AI_MAX_RETRIES):
+            try:
+                if self._limiter is not None:
+                    await self._limiter.acquire()
+                async with self._semaphore():
+                    response = await self.client.chat.completions.create(**kwargs)
+                return response.choices[0].message.content.strip()
+            except (APIConnectionError, RateLimitError, InternalServerError) as e:
+                if attempt == Config.AI_MAX_RETRIES - 1:
+                    raise
+                delay = Config.AI_RETRY_DELAY * 2 ** attempt
+                print(f"{Fore.YELLOW}[RETRY]{Style.RESET_ALL} AI request failed (attempt {attempt + 1}/{Config.AI_MAX_RETRIES}): {e}. Retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
+    async def generate_daily_briefing(self) -> Optional[Path]:
         """Generate daily briefing from last 24 hours of completed tasks."""
         try:
             print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
@@ -87,18 +361,18 @@ class AIBriefingGenerator:
             
             # Get files from last 24 hours
             cutoff = datetime.now() - timedelta(hours=24)
-            done_files = self._get_recent_files(cutoff)
+            done_files = await asyncio.to_thread(self._get_recent_files, cutoff)
             
             if not done_files:
                 print(f"{Fore.YELLOW}[INFO]{Style.RESET_ALL} No completed tasks in last 24 hours")
                 return None
             
             # Count by type
-            stats = self._count_by_type(done_files)
+            stats = await self._count_by_type(done_files)
             
             # Generate summary
             if self.client:
-                summary = self._ai_summarize(done_files, stats, "daily")
+                summary = await self._ai_summarize(done_files, stats, "daily")
             else:
                 summary = self._basic_summary(stats)
             
@@ -112,7 +386,7 @@ class AIBriefingGenerator:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Daily briefing failed: {e}")
             return None
     
-    def generate_weekly_ceo_briefing(self) -> Optional[Path]:
+    async def generate_weekly_ceo_briefing(self) -> Optional[Path]:
         """Generate weekly CEO briefing."""
         try:
             print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
@@ -120,7 +394,7 @@ class AIBriefingGenerator:
             
             # Get files from last 7 days
             cutoff = datetime.now() - timedelta(days=7)
-            done_files = self._get_recent_files(cutoff)
+            done_files = await asyncio.to_thread(self._get_recent_files, cutoff)
             
             # Read business goals
             business_goals = self._read_business_goals()
@@ -130,11 +404,11 @@ class AIBriefingGenerator:
                 return None
             
             # Count by type
-            stats = self._count_by_type(done_files)
+            stats = await self._count_by_type(done_files)
             
             # Generate AI briefing
             if self.client:
-                summary = self._ai_ceo_briefing(done_files, stats, business_goals)
+                summary = await self._ai_ceo_briefing(done_files, stats, business_goals)
             else:
                 summary = self._basic_summary(stats)
             
@@ -148,7 +422,7 @@ class AIBriefingGenerator:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} CEO briefing failed: {e}")
             return None
     
-    def generate_linkedin_post_idea(self) -> Optional[Path]:
+    async def generate_linkedin_post_idea(self) -> Optional[Path]:
         """Generate LinkedIn post idea based on business goals."""
         try:
             print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
@@ -175,7 +449,8 @@ For each idea, provide:
 
 Keep each idea under 200 words. Make them professional but conversational."""
 
-            response = self.client.chat.completions.create(
+            post_ideas = await self._chat(
+                "linkedin",
                 model=Config.OPENROUTER_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a LinkedIn content expert."},
@@ -185,18 +460,17 @@ Keep each idea under 200 words. Make them professional but conversational."""
                 max_tokens=800
             )
             
-            post_ideas = response.choices[0].message.content.strip()
-            
             # Save to Pending_Approval
             Config.VAULT_DIR.joinpath("Pending_Approval").mkdir(parents=True, exist_ok=True)
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             filename = f"LINKEDIN_idea_{timestamp}.md"
             filepath = Config.VAULT_DIR / "Pending_Approval" / filename
             
             content = f"""---
 type: linkedin_idea
-generated: {datetime.now().isoformat()}
+generated: {now.isoformat()}
 status: pending_review
 ---
 ## LinkedIn Post Ideas
@@ -223,19 +497,27 @@ status: pending_review
         if not Config.DONE_DIR.exists():
             return []
         
+        # One pass with os.scandir: each file is stat'ed once and compared as a float timestamp
+        cutoff_ts = cutoff.timestamp()
         recent_files = []
-        for file_path in Config.DONE_DIR.glob("*.md"):
-            try:
-                mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                if mtime > cutoff:
-                    recent_files.append(file_path)
-            except Exception:
-                continue
+        with os.scandir(Config.DONE_DIR) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.endswith(".md"):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime > cutoff_ts:
+                    recent_files.append((mtime, entry.path))
         
-        return sorted(recent_files, key=lambda x: x.stat().st_mtime, reverse=True)
+        recent_files.sort(reverse=True)
+        return [Path(path) for _, path in recent_files]
     
-    def _count_by_type(self, files: List[Path]) -> Dict[str, int]:
-        """Count files by type from frontmatter."""
+    async def _count_by_type(self, files: List[Path]) -> Dict[str, int]:
+        """Count files by type from frontmatter, reading up to FILE_READ_CONCURRENCY files at once."""
         stats = {
             "total": len(files),
             "linkedin_post": 0,
@@ -246,30 +528,72 @@ status: pending_review
             "other": 0,
         }
         
-        for file_path in files:
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                type_match = re.search(r'type:\s*(\w+)', content)
-                if type_match:
-                    file_type = type_match.group(1)
-                    if file_type in stats:
-                        stats[file_type] += 1
-                    else:
-                        stats["other"] += 1
-                else:
-                    stats["other"] += 1
-            except Exception:
+        sem = asyncio.Semaphore(Config.FILE_READ_CONCURRENCY)
+        
+        async def read_type(file_path: Path) -> Optional[str]:
+            async with sem:
+                return await asyncio.to_thread(self._file_type, file_path)
+        
+        # Unreadable files come back as exceptions and count as "other"
+        file_types = await asyncio.gather(*(read_type(f) for f in files), return_exceptions=True)
+        
+        for file_type in file_types:
+            if isinstance(file_type, str) and file_type in stats:
+                stats[file_type] += 1
+            else:
                 stats["other"] += 1
         
         return stats
     
+    def _file_type(self, file_path: Path) -> Optional[str]:
+        """Frontmatter type of a file, re-read only when its mtime has changed."""
+        key = str(file_path)
+        mtime = file_path.stat().st_mtime
+        cached = self._type_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        type_match = _TYPE_RE.search(_read_frontmatter(file_path))
+        file_type = type_match.group(1).decode("ascii") if type_match else None
+        
+        self._type_cache[key] = (mtime, file_type)
+        self._type_cache_dirty = True
+        return file_type
+    
+    def _load_type_cache(self) -> Dict[str, Tuple[float, Optional[str]]]:
+        """Load the type cache sidecar; a missing or corrupt file just starts empty."""
+        try:
+            with open(Config.TYPE_CACHE_FILE, "r", encoding="utf-8") as f:
+                return {path: (entry[0], entry[1]) for path, entry in json.load(f).items()}
+        except (OSError, ValueError, TypeError, IndexError, AttributeError):
+            return {}
+    
+    def _save_type_cache(self):
+        """Persist the type cache, dropping entries for files that no longer exist."""
+        if not self._type_cache_dirty:
+            return
+        try:
+            entries = {path: entry for path, entry in self._type_cache.items() if os.path.exists(path)}
+            tmp_path = Config.TYPE_CACHE_FILE.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, Config.TYPE_CACHE_FILE)
+            self._type_cache_dirty = False
+        except OSError as e:
+            print(f"{Fore.YELLOW}[WARN]{Style.RESET_ALL} Could not save type cache: {e}")
+    
     def _read_business_goals(self) -> str:
-        """Read business goals file."""
-        if Config.BUSINESS_GOALS_FILE.exists():
-            return Config.BUSINESS_GOALS_FILE.read_text(encoding="utf-8")
-        return "No business goals file found."
+        """Read business goals file, re-reading it only when its mtime changes."""
+        try:
+            mtime = Config.BUSINESS_GOALS_FILE.stat().st_mtime
+        except OSError:
+            return "No business goals file found."
+        
+        if self._goals_cache is None or self._goals_cache[0] != mtime:
+            self._goals_cache = (mtime, Config.BUSINESS_GOALS_FILE.read_text(encoding="utf-8"))
+        return self._goals_cache[1]
     
-    def _ai_summarize(self, files: List[Path], stats: Dict[str, int], briefing_type: str) -> str:
+    async def _ai_summarize(self, files: List[Path], stats: Dict[str, int], briefing_type: str) -> str:
         """Generate AI summary of completed tasks."""
         try:
             # Get file names and types
@@ -297,7 +621,8 @@ Provide:
 
 Keep it concise and professional."""
 
-            response = self.client.chat.completions.create(
+            return await self._chat(
+                briefing_type,
                 model=Config.OPENROUTER_MODEL,
                 messages=[
                     {"role": "system", "content": f"You are a business analyst creating a {briefing_type} briefing."},
@@ -307,13 +632,11 @@ Keep it concise and professional."""
                 max_tokens=600
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             print(f"{Fore.YELLOW}[WARN]{Style.RESET_ALL} AI summary failed: {e}")
             return self._basic_summary(stats)
     
-    def _ai_ceo_briefing(self, files: List[Path], stats: Dict[str, int], business_goals: str) -> str:
+    async def _ai_ceo_briefing(self, files: List[Path], stats: Dict[str, int], business_goals: str) -> str:
         """Generate AI CEO briefing."""
         try:
             task_list = "\n".join([f"- {f.name}" for f in files[:30]])
@@ -343,7 +666,8 @@ Create briefing with:
 
 Format professionally for CEO review."""
 
-            response = self.client.chat.completions.create(
+            return await self._chat(
+                "weekly_ceo",
                 model=Config.OPENROUTER_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a strategic business analyst reporting to the CEO."},
@@ -353,8 +677,6 @@ Format professionally for CEO review."""
                 max_tokens=1000
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             print(f"{Fore.YELLOW}[WARN]{Style.RESET_ALL} AI CEO briefing failed: {e}")
             return self._basic_summary(stats)
@@ -377,7 +699,9 @@ AI not available for detailed analysis."""
         """Save briefing to file."""
         Config.BRIEFINGS_DIR.mkdir(parents=True, exist_ok=True)
         
-        today = datetime.now().strftime("%Y-%m-%d")
+        # One timestamp for the filename and both header fields
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
         
         if briefing_type == "daily":
             filename = f"{today}_daily.md"
@@ -391,81 +715,91 @@ AI not available for detailed analysis."""
         
         filepath = Config.BRIEFINGS_DIR / filename
         
-        content = f"""---
+        # Written section by section rather than assembled into one string first
+        with filepath.open("w", encoding="utf-8") as f:
+            f.write(f"""---
 type: {briefing_type}
-generated: {datetime.now().isoformat()}
+generated: {now.isoformat()}
 period: last 24 hours
 ---
 # {title}
 
-**Generated:** {datetime.now().strftime("%Y-%m-%d %H:%M")}
+**Generated:** {now.strftime("%Y-%m-%d %H:%M")}
 
-## Statistics
-- Total tasks: {stats['total']}
-- LinkedIn posts: {stats['linkedin_post']}
-- Emails: {stats['email']}
-- Files: {stats['file_drop']}
-- WhatsApp: {stats['whatsapp_message']}
-- Payments: {stats['payment']}
-
----
-
-{summary}
-
----
-*Generated automatically by AI Employee Scheduler*
-"""
-        
-        filepath.write_text(content, encoding="utf-8")
+""")
+            f.write(_STATS_TEMPLATE.format_map(stats))
+            f.write(summary)
+            f.write(_BRIEFING_FOOTER)
         
         return filepath
 
 
+@functools.lru_cache(maxsize=1)
+def get_generator() -> AIBriefingGenerator:
+    """Shared briefing generator, so a process sets up one AI client and type cache."""
+    return AIBriefingGenerator()
+
+
 class TaskScheduler:
     """Main scheduler service."""
     
     def __init__(self):
-        self.briefing_generator = AIBriefingGenerator()
+        self.briefing_generator = get_generator()
         self.running = True
+        # (name, schedule, job): schedule is a next-run function for clock-time jobs
+        # or an interval in seconds for periodic ones
+        self._jobs: List[Tuple[str, Union[float, Callable[[datetime], datetime]], Callable[[], Any]]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        # One ApprovalManager for the scheduler's lifetime. Both the approval scan and the
+        # LinkedIn check post from Approved/, so they share one lock and never overlap.
+        self._approval_manager = None
+        self._posting_lock = threading.Lock()
+        self._pending_scan: Optional[asyncio.TimerHandle] = None
+        self._background: set = set()
         self._setup_schedule()
     
     def _setup_schedule(self):
         """Set up all scheduled tasks."""
         # Daily briefing at 08:00
-        schedule.every().day.at("08:00").do(
-            self.briefing_generator.generate_daily_briefing
-        )
+        self._jobs.append(("daily briefing", _daily_at("08:00"),
+                           self.briefing_generator.generate_daily_briefing))
         print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Daily briefing at 08:00")
         
         # LinkedIn post idea at 10:00
-        schedule.every().day.at("10:00").do(
-            self.briefing_generator.generate_linkedin_post_idea
-        )
+        self._jobs.append(("LinkedIn post idea", _daily_at("10:00"),
+                           self.briefing_generator.generate_linkedin_post_idea))
         print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} LinkedIn post idea at 10:00")
         
         # Weekly CEO briefing on Sunday at 21:00
-        schedule.every().sunday.at("21:00").do(
-            self.briefing_generator.generate_weekly_ceo_briefing
-        )
+        self._jobs.append(("weekly CEO briefing", _weekly_at(6, "21:00"),
+                           self.briefing_generator.generate_weekly_ceo_briefing))
         print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Weekly CEO briefing on Sunday at 21:00")
         
-        # Needs_Action check every 30 seconds
-        schedule.every(Config.NEEDS_ACTION_INTERVAL // 60).minutes.do(
-            self._check_needs_action
-        )
-        print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Needs_Action check every {Config.NEEDS_ACTION_INTERVAL}s")
+        # Needs_Action: watched for new files, with a slow rescan; polled every 30 seconds otherwise
+        if WATCHFILES_AVAILABLE:
+            self._jobs.append(("Needs_Action check", _every(Config.HOUSEKEEPING_INTERVAL),
+                               self._check_needs_action))
+            print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Needs_Action watched for new files (rescan every {Config.HOUSEKEEPING_INTERVAL}s)")
+        else:
+            self._jobs.append(("Needs_Action check", _every(Config.NEEDS_ACTION_INTERVAL),
+                               self._check_needs_action))
+            print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Needs_Action check every {Config.NEEDS_ACTION_INTERVAL}s")
         
-        # Approval check every 15 seconds (via approval_manager import)
-        schedule.every(Config.APPROVAL_INTERVAL // 60).minutes.do(
-            self._check_approvals
-        )
-        print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Approval check every {Config.APPROVAL_INTERVAL}s")
+        # Approvals: scanned when files land in Approved/Rejected; polled every 15 seconds otherwise
+        if WATCHFILES_AVAILABLE:
+            self._jobs.append(("approval check", _every(Config.HOUSEKEEPING_INTERVAL),
+                               self._check_approvals))
+            print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Approvals watched for new files (rescan every {Config.HOUSEKEEPING_INTERVAL}s)")
+        else:
+            self._jobs.append(("approval check", _every(Config.APPROVAL_INTERVAL),
+                               self._check_approvals))
+            print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} Approval check every {Config.APPROVAL_INTERVAL}s")
         
         # LinkedIn posts every 10 minutes
-        schedule.every(Config.LINKEDIN_INTERVAL // 60).minutes.do(
-            self._check_linkedin_posts
-        )
-        print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} LinkedIn posts check every {Config.LINKEDIN_INTERVAL // 60} minutes")
+        self._jobs.append(("LinkedIn posts check", _every(Config.LINKEDIN_INTERVAL),
+                           self._check_linkedin_posts))
+        print(f"{Fore.GREEN}[SCHEDULED]{Style.RESET_ALL} LinkedIn posts check every {Config.LINKEDIN_INTERVAL}s")
     
     def _check_needs_action(self):
         """Check Needs_Action folder for new tasks."""
@@ -479,12 +813,53 @@ class TaskScheduler:
         except Exception as e:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Needs_Action check failed: {e}")
     
+    async def _watch_needs_action(self):
+        """Report new task files as soon as they land in Needs_Action."""
+        try:
+            Config.NEEDS_ACTION_DIR.mkdir(parents=True, exist_ok=True)
+            async for changes in awatch(Config.NEEDS_ACTION_DIR, recursive=False, stop_event=self._stop_event):
+                new_tasks = [path for change, path in changes if change == Change.added and path.endswith(".md")]
+                if new_tasks:
+                    print(f"{Fore.CYAN}[TASKS]{Style.RESET_ALL} {len(new_tasks)} new task(s) in Needs_Action")
+        except Exception as e:
+            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Needs_Action watcher stopped: {e}")
+    
+    async def _watch_approvals(self):
+        """Scan approvals shortly after files land in Approved or Rejected."""
+        try:
+            for directory in (Config.APPROVED_DIR, Config.REJECTED_DIR):
+                directory.mkdir(parents=True, exist_ok=True)
+            
+            # Pick up anything approved while the scheduler was down
+            self._schedule_approval_scan()
+            async for changes in awatch(Config.APPROVED_DIR, Config.REJECTED_DIR,
+                                        recursive=False, stop_event=self._stop_event):
+                if any(change == Change.added for change, _ in changes):
+                    self._schedule_approval_scan()
+        except Exception as e:
+            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Approval watcher stopped: {e}")
+    
+    def _schedule_approval_scan(self):
+        """Debounce approval scans: one scan APPROVAL_DEBOUNCE seconds after the last new file."""
+        if self._pending_scan is not None:
+            self._pending_scan.cancel()
+        self._pending_scan = self._loop.call_later(Config.APPROVAL_DEBOUNCE, self._start_approval_scan)
+    
+    def _start_approval_scan(self):
+        """Timer callback: run the approval check as a background task."""
+        self._pending_scan = None
+        task = self._loop.create_task(self._run_job(self._check_approvals))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
     def _check_approvals(self):
         """Check approvals using approval_manager."""
         try:
-            from approval_manager import ApprovalManager
-            manager = ApprovalManager()
-            manager.scan_and_process()
+            with self._posting_lock:
+                if self._approval_manager is None:
+                    from approval_manager import ApprovalManager
+                    self._approval_manager = ApprovalManager()
+                self._approval_manager.scan_and_process()
         except ImportError:
             pass
         except Exception as e:
@@ -494,8 +869,9 @@ class TaskScheduler:
         """Check LinkedIn approved posts."""
         try:
             from linkedin_poster import LinkedInPoster
-            poster = LinkedInPoster()
-            posted = poster.post_approved_content()
+            with self._posting_lock:
+                poster = LinkedInPoster()
+                posted = poster.post_approved_content()
             if posted > 0:
                 print(f"{Fore.GREEN}[LINKEDIN]{Style.RESET_ALL} Posted {posted} content(s)")
         except ImportError:
@@ -503,25 +879,85 @@ class TaskScheduler:
         except Exception as e:
             print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} LinkedIn check failed: {e}")
     
+    async def _run_job(self, job: Callable[[], Any]):
+        """Run one job; blocking jobs go to a worker thread so they don't hold up the others."""
+        try:
+            if asyncio.iscoroutinefunction(job):
+                await job()
+            else:
+                await asyncio.to_thread(job)
+        except Exception as e:
+            print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Scheduler error: {e}")
+    
+    async def _job_loop(self, next_run: Callable[[datetime], datetime], job: Callable[[], Any]):
+        """Sleep until the job's next fire time, run it, repeat."""
+        while self.running:
+            target = next_run(datetime.now())
+            while True:
+                remaining = (target - datetime.now()).total_seconds()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, _MAX_SLEEP))
+            await self._run_job(job)
+    
+    async def _periodic(self, seconds: float, job: Callable[[], Any]):
+        """Run the job every N seconds, timed on the monotonic clock."""
+        while self.running:
+            await asyncio.sleep(seconds)
+            await self._run_job(job)
+    
+    async def _main(self):
+        """Start every job loop and wait until the scheduler is stopped."""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: the signal.signal handlers from main() still apply
+        
+        tasks = [
+            asyncio.create_task(
+                self._periodic(schedule, job) if isinstance(schedule, (int, float)) else self._job_loop(schedule, job),
+                name=name
+            )
+            for name, schedule, job in self._jobs
+        ]
+        if WATCHFILES_AVAILABLE:
+            tasks.append(asyncio.create_task(self._watch_needs_action(), name="Needs_Action watcher"))
+            tasks.append(asyncio.create_task(self._watch_approvals(), name="approval watcher"))
+        try:
+            await self._stop_event.wait()
+        finally:
+            if self._pending_scan is not None:
+                self._pending_scan.cancel()
+            tasks.extend(self._background)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def run(self):
         """Run the scheduler loop."""
         print(f"\n{Fore.GREEN}[START]{Style.RESET_ALL} Scheduler running. Press Ctrl+C to stop.\n")
         
-        while self.running:
-            try:
-                schedule.run_pending()
-                time.sleep(1)
-            except KeyboardInterrupt:
-                self.running = False
-            except Exception as e:
-                print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} Scheduler error: {e}")
-                time.sleep(5)
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            self.running = False
         
         print(f"{Fore.YELLOW}[SHUTDOWN]{Style.RESET_ALL} Scheduler stopped.")
     
+    def run_all(self):
+        """Run every scheduled job once, concurrently."""
+        async def run_all_jobs():
+            await asyncio.gather(*(self._run_job(job) for _, _, job in self._jobs))
+        asyncio.run(run_all_jobs())
+    
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
 
 
 def print_banner():
@@ -582,21 +1018,18 @@ def main():
         
         # Handle one-time commands BEFORE creating scheduler
         if args.daily:
-            generator = AIBriefingGenerator()
-            generator.generate_daily_briefing()
+            asyncio.run(get_generator().generate_daily_briefing())
             return
         elif args.weekly:
-            generator = AIBriefingGenerator()
-            generator.generate_weekly_ceo_briefing()
+            asyncio.run(get_generator().generate_weekly_ceo_briefing())
             return
         elif args.linkedin:
-            generator = AIBriefingGenerator()
-            generator.generate_linkedin_post_idea()
+            asyncio.run(get_generator().generate_linkedin_post_idea())
             return
         elif args.once:
             print(f"\n{Fore.CYAN}[RUNNING]{Style.RESET_ALL} All scheduled tasks once...")
             scheduler = TaskScheduler()
-            schedule.run_all()
+            scheduler.run_all()
             return
         
         # Create scheduler for continuous mode
@@ -615,4 +1048,4 @@ def main():
 if __name__ == "__main__":
     main()
 
-# pip install schedule openai colorama python-dotenv
+# pip install openai colorama python-dotenv
@@ -35,7 +35,7 @@ mkdir -p "$PID_DIR"
 
 # Check if Python is available
 if ! command -v python &> /dev/null; then
-    echo -e "${RED}[ERROR] Python not found. Please install Python 3.8+${NC}"
+    echo -e "${RED}[ERROR] Python not found. Please install Python 3.9+${NC}"
     exit 1
 fi
 